@@ -0,0 +1,183 @@
+import math
+import random
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Detail pages each source had in a typical production run; --scale multiplies these
+BASE_LISTINGS: Dict[str, int] = {
+    "cornell-offcampus": 150,
+    "ithaca-renting": 88,
+    "travis-hyde": 25,
+    "urban-ithaca": 30,
+    "lambrou": 56,
+    "demos-johnny": 20,
+}
+# Floor plans per single-building site
+BASE_PLANS = 4
+# The Cornell portal paginates and the scraper stops after 20 pages
+CORNELL_MAX_PAGES = 20
+
+HOSTS = {
+    "listings.offcampusliving.cornell.edu": "cornell-offcampus",
+    "ithacarenting.com": "ithaca-renting",
+    "travishyde.com": "travis-hyde",
+    "www.urbanithaca.com": "urban-ithaca",
+    "www.lambrourealestate.com": "lambrou",
+    "www.demosjohnnycollegetownrentals.com": "demos-johnny",
+}
+
+STREETS = ["College Ave", "Dryden Rd", "Eddy St", "Stewart Ave", "Linden Ave", "E State St",
+           "N Aurora St", "Buffalo St", "Thurston Ave", "Cascadilla St"]
+FEATURES = ["hardwood floors", "in-unit washer and dryer", "dishwasher", "off-street parking",
+            "central air", "gas heat", "electric baseboard heat", "pets allowed", "balcony",
+            "heat and hot water included", "furnished", "walk to campus"]
+
+def _page(title: str, body: str) -> str:
+    return (f"<!DOCTYPE html><html><head><title>{title}</title></head><body>"
+            f"<nav><a href=\"/\">Home</a> <a href=\"/contact\">Contact</a></nav>{body}"
+            f"<footer>Fixture page for load testing</footer></body></html>")
+
+def _links(hrefs_and_text) -> str:
+    return "<ul>" + "".join(f"<li><a href=\"{href}\">{text}</a></li>" for href, text in hrefs_and_text) + "</ul>"
+
+class FixtureSite:
+    """Deterministic stand-in pages for every scraped source, generated on request.
+
+    Index pages list BASE_LISTINGS[source] * scale detail links laid out the
+    way each scraper's discover_urls expects, and every detail page carries
+    the fields its scrape_details looks for. Nothing is stored, so a 100x
+    corpus costs no memory in the server.
+    """
+
+    def __init__(self, scale: float = 1.0, building_hosts=()):
+        self.scale = scale
+        self.building_hosts = set(building_hosts)
+
+    def count(self, source: str) -> int:
+        return max(1, int(round(BASE_LISTINGS[source] * self.scale)))
+
+    def expected_listings(self, sources: Iterable[str], buildings: int) -> int:
+        """Listings a clean run of these sources should produce."""
+        sources = set(sources)
+        detail = sum(self.count(s) for s in BASE_LISTINGS if s in sources and s != "demos-johnny")
+        # Demos Johnny always yields one placeholder; the floor-plan parser keeps at most 40 plans
+        placeholder = 1 if "demos-johnny" in sources else 0
+        plans = min(max(1, int(round(BASE_PLANS * self.scale))), 40)
+        return detail + placeholder + plans * buildings
+
+    def page(self, host: str, path: str) -> Optional[str]:
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+        if host in self.building_hosts:
+            return self._building(host, parsed.path)
+        source = HOSTS.get(host)
+        if source is None:
+            return None
+        return getattr(self, "_" + source.replace("-", "_"))(parsed.path, query)
+
+    def _detail(self, source: str, i: int, title: Optional[str] = None) -> str:
+        rng = random.Random(f"{source}-{i}")
+        beds = rng.randint(1, 6)
+        baths = rng.choice([1.0, 1.5, 2.0, 2.5])
+        rent = rng.randrange(700, 1600, 5) * (beds if rng.random() < 0.3 else 1)
+        street = rng.choice(STREETS)
+        address = f"{100 + i} {street}, Ithaca, NY 14850"
+        description = (f"Spacious {beds} bedroom apartment on {street}. "
+                       + ". ".join(rng.sample(FEATURES, 5)).capitalize()
+                       + ". Available August. Lease runs 12 months.")
+        title = title or f"{100 + i} {street}"
+        return _page(title, f"""
+            <h1>{title}</h1>
+            <p><a href="https://maps.google.com/?q={100 + i}+{street.replace(' ', '+')}">{address}</a></p>
+            <p class="price">${rent:,} / month</p>
+            <p>{beds} Bedrooms</p><p>{baths:g} Bathrooms</p>
+            <h2>Amenities</h2>
+            <div class="description entry-content sqs-block-content"><p>{description}</p></div>
+            <img src="https://{source}.example/wp-content/uploads/listing-{i}-1.jpg">
+            <img src="https://{source}.example/wp-content/uploads/listing-{i}-2.jpg">
+            <a href="/apply">Apply Now</a>""")
+
+    def _cornell_offcampus(self, path: str, query) -> Optional[str]:
+        total = self.count("cornell-offcampus")
+        if path.startswith("/listings/view/"):
+            i = int(path.rsplit("/", 1)[-1])
+            return self._detail("cornell-offcampus", i) if i < total else None
+        if path != "/listings":
+            return None
+        pages = min(CORNELL_MAX_PAGES, math.ceil(total / 50))
+        per_page = math.ceil(total / pages)
+        page = int(query.get("page", ["1"])[0])
+        ids = range((page - 1) * per_page, min(page * per_page, total))
+        nav = f"<a class=\"next\" href=\"/listings?page={page + 1}\">Next</a>" if page < pages else ""
+        return _page("Listings", _links((f"/listings/view/{i}", f"Listing {i}") for i in ids) + nav)
+
+    def _ithaca_renting(self, path: str, query) -> Optional[str]:
+        total = self.count("ithaca-renting")
+        if path.startswith("/unit-details"):
+            i = int(query.get("uid", ["-1"])[0])
+            return self._detail("ithaca-renting", i) if 0 <= i < total else None
+        halves = {"/collegetown/": range(0, total // 2), "/downtown/": range(total // 2, total)}
+        if path not in halves:
+            return None
+        # The real site puts the href on a <p>, so do the same for half of them
+        body = "".join(f"<p href=\"/unit-details/?uid={i}\">Unit {i}</p>" if i % 2 else
+                       f"<a href=\"https://ithacarenting.com/unit-details/?uid={i}\">Unit {i}</a>"
+                       for i in halves[path])
+        return _page("Ithaca Renting", body)
+
+    def _travis_hyde(self, path: str, query) -> Optional[str]:
+        total = self.count("travis-hyde")
+        if path.startswith("/property-"):
+            i = int(path.rsplit("-", 1)[-1])
+            return self._detail("travis-hyde", i) if i < total else None
+        if path != "/residential-properties-ithaca-ny":
+            return None
+        return _page("Residential", _links((f"/property-{i}", "View More") for i in range(total)))
+
+    def _urban_ithaca(self, path: str, query) -> Optional[str]:
+        total = self.count("urban-ithaca")
+        if path.startswith("/detailed-view-more/"):
+            i = int(path.split("/")[2])
+            return self._detail("urban-ithaca", i) if i < total else None
+        halves = {"/apartments": range(0, total // 2), "/houses": range(total // 2, total)}
+        if path not in halves:
+            return None
+        return _page("Urban Ithaca", _links((f"/detailed-view-more/{i}/16/1", "View more") for i in halves[path]))
+
+    def _lambrou(self, path: str, query) -> Optional[str]:
+        total = self.count("lambrou")
+        if path.startswith("/property/"):
+            i = int(path.rsplit("/", 1)[-1])
+            beds = random.Random(f"lambrou-{i}").randint(1, 6)
+            return self._detail("lambrou", i, f"{100 + i} Eddy St ({beds} Bed)") if i < total else None
+        halves = {"/houses": range(0, total // 2), "/apartments": range(total // 2, total)}
+        if path not in halves:
+            return None
+        return _page("Lambrou", _links(
+            (f"/property/{i}", f"{100 + i} Eddy St ({random.Random(f'lambrou-{i}').randint(1, 6)} Bed)")
+            for i in halves[path]
+        ))
+
+    def _demos_johnny(self, path: str, query) -> Optional[str]:
+        if path not in ("/houses", "/apartments"):
+            return None
+        total = self.count("demos-johnny")
+        return _page("Demos Johnny", _links((f"/{path.strip('/')}/{i}", f"Property {i}") for i in range(total)))
+
+    def _building(self, host: str, path: str) -> Optional[str]:
+        if path in ("", "/"):
+            return _page(host, "<h1>Welcome home</h1><a href=\"/floor-plans/\">Floor Plans</a>"
+                               "<p>$50 application fee</p>")
+        if path.rstrip("/") != "/floor-plans":
+            return None
+        plans = max(1, int(round(BASE_PLANS * self.scale)))
+        cards = []
+        for i in range(plans):
+            rng = random.Random(f"{host}-{i}")
+            beds = i % 5
+            label = "Studio" if beds == 0 else f"{beds} Bed"
+            cards.append(f"<div class=\"plan\"><h3>Plan {chr(65 + i % 26)}{i // 26 or ''}</h3>"
+                         f"<p>{label} | {rng.choice([1, 1.5, 2]):g} Bath</p>"
+                         f"<p>Starting at ${rng.randrange(900, 1900, 5):,}/mo</p>"
+                         f"<p>Security deposit $500</p></div>")
+        return _page("Floor Plans", "<div class=\"plans\">" + "".join(cards) + "</div>")
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .fixtures import FixtureSite
+
+def rewrite_url(url: str, port: int) -> str:
+    """https://host/path?q -> http://127.0.0.1:<port>/host/path?q"""
+    _, sep, rest = url.partition('://')
+    return f"http://127.0.0.1:{port}/{rest}" if sep else url
+
+class FaultConfig:
+    """How the stand-in misbehaves. Rates are per-request probabilities."""
+
+    def __init__(self, latency: float = 0.02, jitter: float = 0.03, rate_429: float = 0.0,
+                 rate_timeout: float = 0.0, rate_truncate: float = 0.0, hang_seconds: float = 10.0,
+                 seed: int = 1):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_timeout = rate_timeout
+        self.rate_truncate = rate_truncate
+        self.hang_seconds = hang_seconds
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+class StandInServer:
+    """Local HTTP server that answers for every scraped host, with injected faults.
+
+    Requests arrive as /<original host>/<original path> (see rewrite_url), so one
+    port serves all sources. Pages come from FixtureSite; ETags are derived
+    from the body so conditional GETs get 304s like the real sites.
+    """
+
+    def __init__(self, fixtures: FixtureSite, faults: FaultConfig, port: int = 0):
+        self.fixtures = fixtures
+        self.faults = faults
+        self.outcomes: Counter = Counter()
+        self._rng = random.Random(faults.seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+
+    def reset(self, scale: float):
+        with self._lock:
+            self.fixtures.scale = scale
+            self.outcomes.clear()
+
+    def _roll(self):
+        with self._lock:
+            return self._rng.random(), self._rng.random()
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/__loadtest/'):
+                    return self.control()
+                faults = server.faults
+                roll, jitter = server._roll()
+                time.sleep(faults.latency + jitter * faults.jitter)
+
+                if roll < faults.rate_429:
+                    server._count('429')
+                    self.send_response(429)
+                    self.send_header('Retry-After', '1')
+                    self.end_headers()
+                    return
+                roll -= faults.rate_429
+                if roll < faults.rate_timeout:
+                    # Hold the connection open without answering, then drop it
+                    server._count('timeout')
+                    time.sleep(faults.hang_seconds)
+                    self.close_connection = True
+                    return
+                roll -= faults.rate_timeout
+
+                host, _, path = self.path.lstrip('/').partition('/')
+                try:
+                    body = server.fixtures.page(host, '/' + path)
+                except (ValueError, IndexError):
+                    body = None
+                if body is None:
+                    server._count('404')
+                    self.send_error(404)
+                    return
+
+                data = body.encode()
+                etag = '"' + hashlib.md5(data).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    server._count('304')
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                truncate = roll < faults.rate_truncate
+                server._count('truncated' if truncate else '200')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                # A truncated body promises the full length and hangs up halfway
+                self.wfile.write(data[:len(data) // 2] if truncate else data)
+                if truncate:
+                    self.close_connection = True
+
+            def control(self):
+                # Driver endpoints, never faulted: /__loadtest/reset?scale=N and /__loadtest/stats
+                url = urlparse(self.path)
+                if url.path.endswith('/reset'):
+                    server.reset(float(parse_qs(url.query)['scale'][0]))
+                with server._lock:
+                    data = json.dumps(dict(server.outcomes)).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def _serve(faults: FaultConfig, building_hosts, ports):
+    server = StandInServer(FixtureSite(building_hosts=building_hosts), faults)
+    ports.put(server.port)
+    server.httpd.serve_forever()
+
+def start_in_process(faults: FaultConfig, building_hosts: Iterable[str]) -> Tuple[multiprocessing.Process, int]:
+    """Run the stand-in in its own process, so its threads don't compete with the scrapers for the GIL."""
+    ports = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(faults, list(building_hosts), ports), daemon=True)
+    process.start()
+    return process, ports.get(timeout=30)
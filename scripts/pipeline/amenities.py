@@ -0,0 +1,192 @@
+import argparse
+import json
+import re
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# amenity -> value -> phrases. Matching is case-insensitive on word boundaries;
+# where phrases overlap the longest wins, so "no pets" beats "pets" and
+# "washer/dryer in unit" beats "washer/dryer".
+AMENITY_KEYWORDS: Dict[str, Dict[object, List[str]]] = {
+    "pets": {
+        True: ["pet friendly", "pet-friendly", "pets allowed", "pets welcome", "pets ok", "pets negotiable",
+               "cats allowed", "cats ok", "dogs allowed", "dog friendly", "dog park"],
+        False: ["no pets", "pets not allowed", "no pets allowed", "no dogs", "no cats", "pet free", "pet-free"],
+    },
+    "laundry": {
+        "in-unit": ["in-unit laundry", "in unit laundry", "washer/dryer in unit", "washer and dryer in unit",
+                    "washer & dryer in unit", "in-unit washer", "in unit washer", "w/d in unit", "private laundry"],
+        "on-site": ["laundry on site", "on-site laundry", "onsite laundry", "laundry room", "laundry facilities",
+                    "coin laundry", "coin-operated laundry", "shared laundry", "free laundry", "laundry",
+                    "washer/dryer", "washer and dryer", "washer & dryer"],
+    },
+    "parking": {
+        True: ["parking", "off-street parking", "parking available", "parking included", "garage", "driveway",
+               "parking spot", "parking space"],
+        False: ["no parking", "parking not available", "parking not included"],
+    },
+    "furnished": {
+        True: ["furnished", "fully furnished", "partially furnished", "comes furnished"],
+        False: ["unfurnished", "not furnished"],
+    },
+    "utilities_included": {
+        True: ["utilities included", "all utilities included", "utilities are included", "heat included",
+               "heat and hot water included", "water included", "electric included", "internet included",
+               "wifi included", "all-inclusive", "all inclusive"],
+        False: ["utilities not included", "plus utilities", "+ utilities", "tenant pays utilities",
+                "utilities extra", "utilities separate"],
+    },
+    "dishwasher": {True: ["dishwasher"]},
+    "air_conditioning": {True: ["air conditioning", "central air", "a/c", "ac unit"]},
+    "gym": {True: ["gym", "fitness center", "fitness room", "fitness centre"]},
+}
+
+class AmenityMatcher:
+    """Aho-Corasick automaton over every amenity phrase.
+
+    One pass over a description finds all phrases at once, so adding amenities
+    grows the automaton rather than the number of scans per description.
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[object, List[str]]] = AMENITY_KEYWORDS):
+        self.patterns: List[Tuple[str, object, int]] = [] # (amenity, value, length)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        for amenity, values in keywords.items():
+            for value, phrases in values.items():
+                for phrase in phrases:
+                    self._add(phrase.lower(), (amenity, value, len(phrase)))
+        self._build()
+
+    def _add(self, phrase: str, pattern: Tuple[str, object, int]):
+        state = 0
+        for ch in phrase:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                fallback = self.goto[f].get(ch, 0)
+                self.fail[nxt] = fallback if fallback != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """All whole-word matches as (start, end, pattern index)."""
+        text = text.lower()
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        matches = []
+        state = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for p in out[state]:
+                    start = end - patterns[p][2]
+                    if (start == 0 or not text[start - 1].isalnum()) and (end == n or not text[end].isalnum()):
+                        matches.append((start, end, p))
+        return matches
+
+    def extract(self, text: str) -> Dict[str, object]:
+        """Amenity flags found in text. Amenities that aren't mentioned are left out."""
+        if not text:
+            return {}
+        # Leftmost-longest: drop matches contained in a longer one
+        matches = sorted(self.find(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        flags: Dict[str, object] = {}
+        covered_until = -1
+        for start, end, p in matches:
+            if end <= covered_until:
+                continue
+            covered_until = end
+            amenity, value, _ = self.patterns[p]
+            flags.setdefault(amenity, value)
+        return flags
+
+    def attach(self, listings: Iterable) -> int:
+        """Set the amenities dict on each listing (dicts or Listing objects). Returns count with any found."""
+        count = 0
+        for listing in listings:
+            data = listing if isinstance(listing, dict) else vars(listing)
+            data['amenities'] = self.extract(data.get('description') or '')
+            if data['amenities']:
+                count += 1
+        return count
+
+def _regex_baseline(keywords: Dict[str, Dict[object, List[str]]]):
+    """The one-regex-per-phrase approach parse_heating_source uses, for benchmarking."""
+    compiled = [
+        (amenity, value, re.compile(r"(?<!\w)" + re.escape(phrase) + r"(?!\w)", re.IGNORECASE))
+        for amenity, values in keywords.items()
+        for value, phrases in values.items()
+        for phrase in sorted(phrases, key=len, reverse=True)
+    ]
+
+    def extract(text: str) -> Dict[str, object]:
+        flags = {}
+        for amenity, value, regex in compiled:
+            if amenity not in flags and regex.search(text):
+                flags[amenity] = value
+        return flags
+    return extract
+
+def benchmark(descriptions: List[str], repeat: int = 5) -> Dict[str, float]:
+    matcher = AmenityMatcher()
+    baseline = _regex_baseline(AMENITY_KEYWORDS)
+    results = {}
+    for name, fn in (("automaton", matcher.extract), ("regex per phrase", baseline)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in descriptions:
+                fn(text)
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract amenity flags from listing descriptions.")
+    parser.add_argument('--input', default='scripts/data/scraped_listings.json')
+    parser.add_argument('--output', help='Defaults to updating --input in place')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Time the automaton against one regex per phrase instead of writing output')
+    args = parser.parse_args(argv)
+
+    with open(args.input) as f:
+        data = json.load(f)
+
+    if args.benchmark:
+        descriptions = [d.get('description') or '' for d in data]
+        total = sum(len(d) for d in descriptions)
+        patterns = sum(len(p) for values in AMENITY_KEYWORDS.values() for p in values.values())
+        print(f"{len(descriptions)} descriptions, {total} chars, {patterns} phrases")
+        for name, seconds in benchmark(descriptions).items():
+            print(f"  {name:18} {seconds * 1000:8.2f} ms")
+        return
+
+    count = AmenityMatcher().attach(data)
+    print(f"Found amenities in {count}/{len(data)} listings")
+    with open(args.output or args.input, 'w') as f:
+        json.dump(data, f, indent=2)
+
+if __name__ == "__main__":
+    main()
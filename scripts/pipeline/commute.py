@@ -0,0 +1,216 @@
+import argparse
+import gzip
+import heapq
+import json
+import math
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Campus destinations students actually walk to
+CAMPUS_DESTINATIONS: Dict[str, Tuple[float, float]] = {
+    "Ho Plaza": (42.4468, -76.4848),
+    "Engineering Quad": (42.4445, -76.4827),
+    "Ag Quad": (42.4490, -76.4785),
+}
+
+WALKABLE_HIGHWAYS = {
+    "footway", "path", "pedestrian", "steps", "living_street", "residential", "service",
+    "unclassified", "tertiary", "tertiary_link", "secondary", "secondary_link",
+    "primary", "primary_link", "track", "corridor", "crossing",
+}
+
+WALKING_METERS_PER_MINUTE = 80.0 # ~3 mph
+# Ithaca's stairways are slow going; no elevation in the extract, so this is the only hill signal
+STEPS_PENALTY = 2.0
+# Campus destinations are areas, not points: every node within this radius is a source
+SOURCE_RADIUS_METERS = 75.0
+# Listings farther than this from any walkable node don't get a walking time
+MAX_SNAP_METERS = 300.0
+
+EARTH_RADIUS_METERS = 6371000.0
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+def _open(path: str):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+class WalkingNetwork:
+    """Walking graph from an OSM XML extract, with precomputed times to campus.
+
+    Loading runs one multi-source Dijkstra per campus destination over the whole
+    graph, so every node knows its walking time to each destination. Attaching
+    times to a listing is then a nearest-node lookup in a grid index.
+    """
+
+    GRID_DEGREES = 0.002 # ~200m cells
+
+    def __init__(self, lats: array, lons: array, adjacency: List[List[Tuple[int, float]]],
+                 destinations: Dict[str, Tuple[float, float]] = CAMPUS_DESTINATIONS):
+        self.lats = lats
+        self.lons = lons
+        self.adjacency = adjacency
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(len(lats)):
+            self.grid.setdefault(self._cell(lats[i], lons[i]), []).append(i)
+        self.minutes: Dict[str, array] = {}
+        for name, (lat, lon) in destinations.items():
+            minutes = self._shortest_paths(lat, lon)
+            if minutes is None:
+                print(f"  No walkable node within {MAX_SNAP_METERS:g}m of {name}; is it inside the extract?")
+            else:
+                self.minutes[name] = minutes
+
+    @classmethod
+    def from_osm(cls, path: str, destinations: Dict[str, Tuple[float, float]] = CAMPUS_DESTINATIONS) -> "WalkingNetwork":
+        coords: Dict[int, Tuple[float, float]] = {}
+        ways: List[Tuple[List[int], float]] = []
+        with _open(path) as f:
+            root = None
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                if event == 'start' or elem.tag not in ('node', 'way', 'relation'):
+                    continue
+                if elem.tag == 'node':
+                    coords[int(elem.get('id'))] = (float(elem.get('lat')), float(elem.get('lon')))
+                elif elem.tag == 'way':
+                    tags = {t.get('k'): t.get('v') for t in elem.iter('tag')}
+                    highway = tags.get('highway')
+                    if highway in WALKABLE_HIGHWAYS and tags.get('foot') != 'no' and tags.get('access') != 'private':
+                        refs = [int(nd.get('ref')) for nd in elem.iter('nd')]
+                        ways.append((refs, STEPS_PENALTY if highway == 'steps' else 1.0))
+                # Drop each finished element from <osm> too, or the whole extract stays in memory
+                root.clear()
+
+        index: Dict[int, int] = {}
+        lats, lons = array('d'), array('d')
+        adjacency: List[List[Tuple[int, float]]] = []
+
+        def node_index(osm_id: int) -> int:
+            i = index.get(osm_id)
+            if i is None:
+                i = index[osm_id] = len(adjacency)
+                lat, lon = coords[osm_id]
+                lats.append(lat)
+                lons.append(lon)
+                adjacency.append([])
+            return i
+
+        for refs, penalty in ways:
+            refs = [r for r in refs if r in coords]
+            for a, b in zip(refs, refs[1:]):
+                ia, ib = node_index(a), node_index(b)
+                meters = haversine_meters(lats[ia], lons[ia], lats[ib], lons[ib]) * penalty
+                adjacency[ia].append((ib, meters))
+                adjacency[ib].append((ia, meters))
+        print(f"Loaded walking network: {len(adjacency)} nodes from {len(ways)} ways")
+        return cls(lats, lons, adjacency, destinations)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (int(math.floor(lat / self.GRID_DEGREES)), int(math.floor(lon / self.GRID_DEGREES)))
+
+    def _near(self, lat: float, lon: float, radius: float) -> Iterable[Tuple[int, float]]:
+        """Nodes within radius meters as (index, meters)."""
+        ci, cj = self._cell(lat, lon)
+        # A grid cell is at least ~160m across at Ithaca's latitude
+        reach = int(math.ceil(radius / 160.0))
+        for di in range(-reach, reach + 1):
+            for dj in range(-reach, reach + 1):
+                for i in self.grid.get((ci + di, cj + dj), ()):
+                    d = haversine_meters(lat, lon, self.lats[i], self.lons[i])
+                    if d <= radius:
+                        yield i, d
+
+    def nearest_node(self, lat: float, lon: float, max_meters: float = MAX_SNAP_METERS) -> Optional[Tuple[int, float]]:
+        return min(self._near(lat, lon, max_meters), key=lambda x: x[1], default=None)
+
+    def _shortest_paths(self, lat: float, lon: float) -> Optional[array]:
+        """Walking minutes from every node to the destination (graph is undirected).
+
+        None if the extract has no walkable node near the destination.
+        """
+        sources = list(self._near(lat, lon, SOURCE_RADIUS_METERS))
+        if not sources:
+            nearest = self.nearest_node(lat, lon)
+            if nearest is None:
+                return None
+            sources = [nearest]
+        dist = array('d', [math.inf]) * len(self.adjacency)
+        heap = []
+        for i, d in sources:
+            if d < dist[i]:
+                dist[i] = d
+                heap.append((d, i))
+        heapq.heapify(heap)
+        adjacency = self.adjacency
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            for j, w in adjacency[i]:
+                nd = d + w
+                if nd < dist[j]:
+                    dist[j] = nd
+                    heapq.heappush(heap, (nd, j))
+        return array('d', (d / WALKING_METERS_PER_MINUTE for d in dist))
+
+    def walking_minutes(self, lat: float, lon: float) -> Optional[Dict[str, float]]:
+        """Minutes to each destination from a point, including the walk to the nearest node."""
+        if not lat and not lon:
+            return None
+        nearest = self.nearest_node(lat, lon)
+        if nearest is None:
+            return None
+        i, snap = nearest
+        return {
+            name: round(minutes[i] + snap / WALKING_METERS_PER_MINUTE, 1)
+            for name, minutes in self.minutes.items() if minutes[i] < math.inf
+        } or None
+
+    def attach(self, listings: Iterable) -> int:
+        """Set walking_minutes_to_campus on each listing (dicts or Listing objects). Returns count set."""
+        count = 0
+        for listing in listings:
+            data = listing if isinstance(listing, dict) else vars(listing)
+            minutes = self.walking_minutes(data.get('latitude') or 0.0, data.get('longitude') or 0.0)
+            data['walking_minutes_to_campus'] = min(minutes.values()) if minutes else None
+            if minutes:
+                count += 1
+        return count
+
+    def matrix(self, listings: Iterable) -> Dict[str, Dict[str, float]]:
+        """Per-listing URL walking minutes to every destination."""
+        result = {}
+        for listing in listings:
+            data = listing if isinstance(listing, dict) else vars(listing)
+            minutes = self.walking_minutes(data.get('latitude') or 0.0, data.get('longitude') or 0.0)
+            if minutes:
+                result[data['url']] = minutes
+        return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Attach walking minutes to campus from a local OSM extract.")
+    parser.add_argument('osm', help='OSM XML extract (.osm or .osm.gz) covering Ithaca')
+    parser.add_argument('--input', default='scripts/data/scraped_listings.json')
+    parser.add_argument('--output', help='Defaults to updating --input in place')
+    parser.add_argument('--matrix', help='Also write per-destination minutes keyed by URL to this file')
+    args = parser.parse_args(argv)
+
+    with open(args.input) as f:
+        data = json.load(f)
+    network = WalkingNetwork.from_osm(args.osm)
+    count = network.attach(data)
+    print(f"Attached walking times to {count}/{len(data)} listings")
+    with open(args.output or args.input, 'w') as f:
+        json.dump(data, f, indent=2)
+    if args.matrix:
+        with open(args.matrix, 'w') as f:
+            json.dump(network.matrix(data), f, indent=2)
+
+if __name__ == "__main__":
+    main()
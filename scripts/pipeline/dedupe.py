@@ -0,0 +1,144 @@
+import argparse
+import json
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SHINGLE_SIZE = 5 # characters
+NUM_PERM = 128
+BANDS = 16 # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+THRESHOLD = 0.7
+# Shorter descriptions ("Student housing.") are too generic to call duplicates
+MIN_CHARS = 40
+# Hash matrix is NUM_PERM x chunk; 16k shingles keeps it around 16MB
+CHUNK_SHINGLES = 16384
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct byte k-grams of text, each packed exactly into one uint64 (k <= 8)."""
+    data = np.frombuffer(text.encode(), dtype=np.uint8).astype(np.uint64)
+    n = len(data) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+    grams = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        grams |= data[j:j + n] << np.uint64(8 * j)
+    return np.unique(grams)
+
+class MinHasher:
+    """Multiply-shift MinHash, computed over many documents at once with numpy."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = (rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signatures(self, docs: List[np.ndarray]) -> np.ndarray:
+        """(len(docs), num_perm) signatures. Every doc must have at least one shingle."""
+        out = np.empty((len(docs), self.num_perm), dtype=np.uint32)
+        start = 0
+        while start < len(docs):
+            end, size = start, 0
+            while end < len(docs) and (end == start or size + len(docs[end]) <= CHUNK_SHINGLES):
+                size += len(docs[end])
+                end += 1
+            hashes = np.concatenate(docs[start:end])
+            offsets = np.cumsum([0] + [len(d) for d in docs[start:end - 1]])
+            # Wrapping uint64 multiply then keep the high 32 bits
+            with np.errstate(over='ignore'):
+                permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) >> np.uint64(32)
+            out[start:end] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            start = end
+        return out
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+def similar_groups(listings: List[Dict], threshold: float = THRESHOLD, bands: int = BANDS,
+                   hasher: Optional[MinHasher] = None) -> List[List[int]]:
+    """Groups (as listing indexes) whose descriptions are near-duplicates.
+
+    Identical texts are collapsed first, so boilerplate repeated across a
+    hundred units costs one signature. Within an LSH bucket every member is
+    only checked against the bucket's first member, which keeps big buckets
+    linear; chains of similarity still join up through union-find.
+    """
+    hasher = hasher or MinHasher()
+    rows = hasher.num_perm // bands
+
+    by_text: Dict[str, List[int]] = defaultdict(list)
+    for i, listing in enumerate(listings):
+        text = normalize(listing.get('description') or '')
+        if len(text) >= MIN_CHARS:
+            by_text[text].append(i)
+    texts = list(by_text)
+    if not texts:
+        return []
+
+    sigs = hasher.signatures([shingle_hashes(t) for t in texts])
+    uf = _UnionFind(len(texts))
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        chunk = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows])
+        for t in range(len(texts)):
+            key = chunk[t].tobytes()
+            first = buckets.setdefault(key, t)
+            if first != t and uf.find(first) != uf.find(t):
+                if np.count_nonzero(sigs[first] == sigs[t]) / hasher.num_perm >= threshold:
+                    uf.union(first, t)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for t, text in enumerate(texts):
+        groups[uf.find(t)].extend(by_text[text])
+    return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+def latest_by_url(snapshots: List[List[Dict]]) -> List[Dict]:
+    """Merge snapshots so each URL appears once, keeping its newest copy."""
+    rows: Dict[str, Dict] = {}
+    for snapshot in snapshots:
+        for listing in snapshot:
+            prev = rows.get(listing['url'])
+            if prev is None or (listing.get('created_at') or '') >= (prev.get('created_at') or ''):
+                rows[listing['url']] = listing
+    return list(rows.values())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Group listings with near-duplicate descriptions.")
+    parser.add_argument('inputs', nargs='*', default=['scripts/data/scraped_listings.json'],
+                        help='One or more scraped_listings.json snapshots')
+    parser.add_argument('--output', default='scripts/data/similar_groups.json')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    snapshots = []
+    for path in args.inputs:
+        with open(path) as f:
+            snapshots.append(json.load(f))
+    listings = latest_by_url(snapshots)
+    groups = similar_groups(listings, args.threshold)
+    result = [{'size': len(g), 'urls': [listings[i]['url'] for i in g],
+               'titles': sorted({listings[i]['title'] for i in g})} for g in groups]
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"{len(listings)} listings, {len(groups)} similarity groups covering "
+          f"{sum(len(g) for g in groups)} listings -> {args.output}")
+
+if __name__ == "__main__":
+    main()
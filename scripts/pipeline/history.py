@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_DB = 'scripts/data/history.sqlite'
+
+SCHEMA = """
+create table if not exists snapshots (
+  id integer primary key,
+  taken_at text not null,
+  source text
+);
+
+create table if not exists observations (
+  url text not null,
+  snapshot_id integer not null references snapshots(id),
+  observed_at text not null,
+  week text not null,
+  rent integer,
+  bedrooms integer,
+  bathrooms real,
+  neighborhood text,
+  available integer not null default 1,
+  primary key (url, snapshot_id)
+) without rowid;
+
+-- Which scraper last returned each URL, so a run only expires URLs of sources it scraped
+create table if not exists listing_sources (
+  url text primary key,
+  source text not null
+) without rowid;
+
+-- Rent trajectory of a single URL
+create index if not exists observations_url_time on observations (url, observed_at);
+-- Weekly medians by neighborhood/bedrooms; covers rent so the scan never touches the table
+create index if not exists observations_week_group
+  on observations (week, neighborhood, bedrooms, rent) where available = 1;
+"""
+
+def week_of(timestamp: str) -> str:
+    """Monday (ISO week start) of the week containing the timestamp."""
+    day = datetime.fromisoformat(timestamp).date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def _as_dict(listing) -> Dict:
+    return listing if isinstance(listing, dict) else vars(listing)
+
+class HistoryStore:
+    """Append-only SQLite history of scraped listings, keyed by listing URL."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('pragma journal_mode=wal')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, listings: Iterable, taken_at: Optional[str] = None,
+               source: Optional[str] = None, mark_missing: bool = False,
+               sources: Optional[Dict[str, Dict]] = None) -> int:
+        """Store one snapshot. Returns the snapshot id.
+
+        With mark_missing, URLs whose latest observation is available but which
+        are absent from this snapshot get an available=0 row. sources is a run
+        manifest's {slug: {'ok', 'urls'}}; when given, only URLs last returned by
+        a source that scraped ok in this run are marked, so --only runs and
+        crashed scrapers leave the other sources' listings alone.
+        """
+        taken_at = taken_at or datetime.now(timezone.utc).isoformat()
+        week = week_of(taken_at)
+        with self.conn:
+            snapshot_id = self.conn.execute(
+                'insert into snapshots (taken_at, source) values (?, ?)', (taken_at, source)
+            ).lastrowid
+            rows = {}
+            for listing in listings:
+                data = _as_dict(listing)
+                if not data.get('url'):
+                    continue
+                # An imputed rent is the model's guess, not an observation
+                rent = None if (data.get('rent_flag') or '').endswith('_imputed') else data.get('rent')
+                rows[data['url']] = (data['url'], snapshot_id, taken_at, week, rent,
+                                     data.get('bedrooms'), data.get('bathrooms'), data.get('neighborhood'), 1)
+            self.conn.executemany(
+                'insert or replace into observations values (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows.values()
+            )
+            seen = set(rows)
+            ok_sources = None
+            if sources is not None:
+                ok_sources = [slug for slug, entry in sources.items() if entry['ok']]
+                for slug, entry in sources.items():
+                    seen.update(entry['urls'])
+                self.conn.executemany(
+                    'insert or replace into listing_sources values (?, ?)',
+                    ((url, slug) for slug in ok_sources for url in sources[slug]['urls'])
+                )
+            if mark_missing:
+                self._mark_missing(snapshot_id, taken_at, week, seen, ok_sources)
+        return snapshot_id
+
+    def _mark_missing(self, snapshot_id: int, taken_at: str, week: str, seen: set,
+                      ok_sources: Optional[List[str]]):
+        query = """
+            select o.url, o.bedrooms, o.bathrooms, o.neighborhood from observations o
+            {join}
+            where o.available = 1
+              and o.snapshot_id = (select max(snapshot_id) from observations where url = o.url)
+        """
+        if ok_sources is None:
+            cur = self.conn.execute(query.format(join=''))
+        elif not ok_sources:
+            return
+        else:
+            join = f"join listing_sources s on s.url = o.url and s.source in ({','.join('?' * len(ok_sources))})"
+            cur = self.conn.execute(query.format(join=join), ok_sources)
+        missing = [(url, snapshot_id, taken_at, week, None, beds, baths, hood, 0)
+                   for url, beds, baths, hood in cur.fetchall() if url not in seen]
+        self.conn.executemany('insert into observations values (?, ?, ?, ?, ?, ?, ?, ?, ?)', missing)
+
+    def import_snapshot(self, path: str, mark_missing: bool = False) -> int:
+        """Backfill from an existing scraped_listings.json file."""
+        with open(path) as f:
+            data = json.load(f)
+        stamps = [d['created_at'] for d in data if d.get('created_at')]
+        taken_at = min(stamps) if stamps else datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).isoformat()
+        return self.record(data, taken_at=taken_at, source=path, mark_missing=mark_missing)
+
+    def trajectory(self, url: str) -> List[Dict]:
+        cur = self.conn.execute("""
+            select observed_at, rent, bedrooms, available from observations
+            where url = ? order by observed_at
+        """, (url,))
+        return [dict(zip(('observed_at', 'rent', 'bedrooms', 'available'), row)) for row in cur]
+
+    def weekly_medians(self, neighborhood: Optional[str] = None, bedrooms: Optional[int] = None,
+                       since: Optional[str] = None) -> List[Dict]:
+        """Median rent per (week, neighborhood, bedrooms), ignoring rent=0 placeholders."""
+        clauses, params = ['available = 1', 'rent > 0'], []
+        if since:
+            clauses.append('week >= ?')
+            params.append(week_of(since))
+        if neighborhood:
+            clauses.append('neighborhood = ?')
+            params.append(neighborhood)
+        if bedrooms is not None:
+            clauses.append('bedrooms = ?')
+            params.append(bedrooms)
+        # A URL seen in several snapshots in one week counts once, at its latest rent
+        cur = self.conn.execute(f"""
+            select week, neighborhood, bedrooms, rent from observations o
+            where {' and '.join(clauses)}
+              and observed_at = (select max(observed_at) from observations
+                                 where url = o.url and week = o.week and available = 1)
+            order by week, neighborhood, bedrooms
+        """, params)
+        results = []
+        for (week, hood, beds), group in groupby(cur, key=lambda r: r[:3]):
+            rents = [r[3] for r in group]
+            results.append({'week': week, 'neighborhood': hood, 'bedrooms': beds,
+                            'median_rent': statistics.median(rents), 'count': len(rents)})
+        return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or backfill the listing rent history.")
+    parser.add_argument('--db', default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help='Backfill from scraped_listings.json snapshots')
+    imp.add_argument('files', nargs='+')
+    imp.add_argument('--mark-missing', action='store_true')
+    traj = sub.add_parser('trajectory', help='Rent history of one listing URL')
+    traj.add_argument('url')
+    med = sub.add_parser('medians', help='Weekly median rent by neighborhood and bedrooms')
+    med.add_argument('--neighborhood')
+    med.add_argument('--bedrooms', type=int)
+    med.add_argument('--since')
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    try:
+        if args.command == 'import':
+            for path in sorted(args.files, key=os.path.getmtime):
+                snapshot_id = store.import_snapshot(path, mark_missing=args.mark_missing)
+                print(f"Imported {path} as snapshot {snapshot_id}")
+        elif args.command == 'trajectory':
+            print(json.dumps(store.trajectory(args.url), indent=2))
+        elif args.command == 'medians':
+            print(json.dumps(store.weekly_medians(args.neighborhood, args.bedrooms, args.since), indent=2))
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
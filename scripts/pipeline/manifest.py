@@ -0,0 +1,32 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+DEFAULT_MANIFEST = 'scripts/data/scrape_manifest.json'
+
+class RunManifest:
+    """Which URLs each scraper saw in a run, for per-source expiry at seed time.
+
+    The seed step only counts a stored listing as missed when its source
+    scraped successfully and didn't return the URL, so a scraper that
+    crashes (or comes back empty) never expires its listings.
+    """
+
+    def __init__(self, full_run: bool, run_at: Optional[str] = None):
+        self.run_at = run_at or datetime.now(timezone.utc).isoformat()
+        self.full_run = full_run
+        self.sources: Dict[str, Dict] = {}
+
+    def add(self, source: str, urls: Iterable[str], ok: bool = True):
+        entry = self.sources.setdefault(source, {'ok': True, 'urls': []})
+        entry['ok'] = entry['ok'] and ok
+        entry['urls'].extend(u for u in urls if u)
+
+    def fail(self, source: str):
+        self.add(source, [], ok=False)
+
+    def write(self, path: str = DEFAULT_MANIFEST):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'run_at': self.run_at, 'full_run': self.full_run, 'sources': self.sources}, f, indent=2)
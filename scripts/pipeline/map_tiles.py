@@ -0,0 +1,138 @@
+import argparse
+import json
+import math
+import os
+import shutil
+from typing import Dict, List, Tuple
+
+DEFAULT_OUTPUT = 'public/map-tiles'
+
+MIN_ZOOM = 10 # Whole county
+MAX_ZOOM = 17 # Zoom levels above this show individual listings
+RADIUS = 40 # Cluster radius in pixels
+EXTENT = 256 # Tile size in pixels
+
+def project(lat: float, lon: float) -> Tuple[float, float]:
+    """Web Mercator position in [0, 1] x [0, 1]."""
+    x = lon / 360 + 0.5
+    sin = math.sin(math.radians(lat))
+    y = 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi
+    return x, min(max(y, 0.0), 1.0)
+
+def unproject(x: float, y: float) -> Tuple[float, float]:
+    lon = (x - 0.5) * 360
+    lat = math.degrees(2 * math.atan(math.exp((0.5 - y) * 2 * math.pi)) - math.pi / 2)
+    return lat, lon
+
+class ClusterIndex:
+    """Hierarchical greedy point clustering, one level per zoom (as in supercluster).
+
+    Each level is built from the one above it, so the whole hierarchy costs
+    O(n) grid lookups per zoom level. Items are [x, y, count, id, expansion_zoom]
+    where id is the listing index for single points, and expansion_zoom is the
+    zoom at which a cluster splits into its children.
+    """
+
+    def __init__(self, listings: List[Dict], min_zoom: int = MIN_ZOOM, max_zoom: int = MAX_ZOOM,
+                 radius: float = RADIUS, extent: int = EXTENT):
+        self.listings = listings
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        points = []
+        for i, listing in enumerate(listings):
+            lat, lon = listing.get('latitude') or 0.0, listing.get('longitude') or 0.0
+            if lat or lon: # 0,0 means the scraper never geocoded it
+                x, y = project(lat, lon)
+                points.append([x, y, 1, i, None])
+        self.levels: Dict[int, List[list]] = {max_zoom + 1: points}
+        self._next_id = len(listings)
+        for z in range(max_zoom, min_zoom - 1, -1):
+            self.levels[z] = self._cluster(self.levels[z + 1], z, radius / (extent * 2 ** z))
+
+    def _cluster(self, items: List[list], zoom: int, r: float) -> List[list]:
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for n, item in enumerate(items):
+            grid.setdefault((int(item[0] / r), int(item[1] / r)), []).append(n)
+        used = [False] * len(items)
+        clusters = []
+        r2 = r * r
+        for n, item in enumerate(items):
+            if used[n]:
+                continue
+            used[n] = True
+            cx, cy = int(item[0] / r), int(item[1] / r)
+            members = [item]
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for m in grid.get((gx, gy), ()):
+                        other = items[m]
+                        if not used[m] and (other[0] - item[0]) ** 2 + (other[1] - item[1]) ** 2 <= r2:
+                            used[m] = True
+                            members.append(other)
+            if len(members) == 1:
+                clusters.append(item)
+                continue
+            count = sum(m[2] for m in members)
+            x = sum(m[0] * m[2] for m in members) / count
+            y = sum(m[1] * m[2] for m in members) / count
+            clusters.append([x, y, count, self._next_id, zoom + 1])
+            self._next_id += 1
+        return clusters
+
+    def tiles(self) -> Dict[Tuple[int, int, int], dict]:
+        """Tile payloads keyed by (z, x, y). Only non-empty tiles are produced."""
+        tiles: Dict[Tuple[int, int, int], dict] = {}
+        for z, items in self.levels.items():
+            scale = 2 ** z
+            for x, y, count, ref, expansion_zoom in items:
+                key = (z, min(int(x * scale), scale - 1), min(int(y * scale), scale - 1))
+                tile = tiles.setdefault(key, {'clusters': [], 'points': []})
+                lat, lon = unproject(x, y)
+                if count > 1:
+                    tile['clusters'].append([round(lon, 6), round(lat, 6), count, expansion_zoom])
+                else:
+                    listing = self.listings[ref]
+                    tile['points'].append([round(lon, 6), round(lat, 6), listing.get('rent'),
+                                           listing.get('url'), listing.get('title'),
+                                           bool(listing.get('is_official_listing', True))])
+        return tiles
+
+def write_tiles(listings: List[Dict], output: str = DEFAULT_OUTPUT, **kwargs) -> int:
+    """Write {z}/{x}/{y}.json tiles plus an index.json. Returns the number of tiles."""
+    index = ClusterIndex(listings, **kwargs)
+    tiles = index.tiles()
+    # Only clear a directory we generated ourselves
+    if os.path.exists(os.path.join(output, 'index.json')):
+        shutil.rmtree(output)
+    for (z, x, y), tile in tiles.items():
+        path = os.path.join(output, str(z), str(x))
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, f"{y}.json"), 'w') as f:
+            json.dump(tile, f, separators=(',', ':'))
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, 'index.json'), 'w') as f:
+        json.dump({
+            'min_zoom': index.min_zoom,
+            'max_zoom': index.max_zoom + 1,
+            'cluster_fields': ['lng', 'lat', 'count', 'expansion_zoom'],
+            'point_fields': ['lng', 'lat', 'rent', 'url', 'title', 'is_official_listing'],
+            'tiles': sorted(f"{z}/{x}/{y}" for z, x, y in tiles),
+        }, f, separators=(',', ':'))
+    return len(tiles)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute clustered map tiles for listing markers.")
+    parser.add_argument('--input', default='scripts/data/scraped_listings.json')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--min-zoom', type=int, default=MIN_ZOOM)
+    parser.add_argument('--max-zoom', type=int, default=MAX_ZOOM)
+    parser.add_argument('--radius', type=float, default=RADIUS)
+    args = parser.parse_args(argv)
+
+    with open(args.input) as f:
+        data = json.load(f)
+    count = write_tiles(data, args.output, min_zoom=args.min_zoom, max_zoom=args.max_zoom, radius=args.radius)
+    print(f"Wrote {count} tiles to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+DEFAULT_PROFILE_DIR = 'scripts/data/profiles'
+
+# (label, file path fragment, function name) whose cumulative time is reported
+# separately, so a slow run can be split into waiting on the network vs parsing
+BUCKETS = [
+    ("network", "requests/adapters.py", "send"),
+    ("html parse", "bs4/__init__.py", "__init__"),
+    ("soup search", "bs4/element.py", "_find_all"),
+    ("regex", "re/__init__.py", "_compile"),
+    ("sleep", "~", "<built-in method time.sleep>"),
+]
+
+class ScraperProfiler:
+    """cProfile + tracemalloc around each scraper, with a combined summary.
+
+    Writes <dir>/<scraper>.prof (open with snakeviz or pstats) and
+    <dir>/summary.txt / summary.json with per-scraper wall time, peak memory,
+    the time buckets above and the top-N functions by own time.
+    """
+
+    def __init__(self, out_dir: str = DEFAULT_PROFILE_DIR, top_n: int = 15):
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.results: Dict[str, Dict] = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    @contextmanager
+    def profile(self, name: str):
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            wall = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            allocations = tracemalloc.take_snapshot().statistics('lineno')[:5]
+            tracemalloc.stop()
+            profiler.dump_stats(os.path.join(self.out_dir, f"{name}.prof"))
+            self.results[name] = self._summarize(profiler, wall, peak, allocations)
+
+    def _summarize(self, profiler: cProfile.Profile, wall: float, peak: int, allocations) -> Dict:
+        stats = pstats.Stats(profiler)
+        buckets = {label: 0.0 for label, _, _ in BUCKETS}
+        rows = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            for label, fragment, name in BUCKETS:
+                if func == name and fragment in filename.replace(os.sep, '/'):
+                    buckets[label] += cumtime
+            rows.append((tottime, cumtime, ncalls, f"{os.path.basename(filename)}:{line}({func})"))
+        rows.sort(reverse=True)
+        return {
+            'wall_seconds': round(wall, 3),
+            'peak_memory_mb': round(peak / 1e6, 2),
+            'buckets_seconds': {k: round(v, 3) for k, v in buckets.items()},
+            'top_functions': [
+                {'function': where, 'calls': ncalls, 'own_seconds': round(tottime, 4), 'cum_seconds': round(cumtime, 4)}
+                for tottime, cumtime, ncalls, where in rows[:self.top_n]
+            ],
+            'top_allocations': [
+                {'where': str(stat.traceback[0]), 'kb': round(stat.size / 1024, 1)} for stat in allocations
+            ],
+        }
+
+    def write_summary(self) -> str:
+        with open(os.path.join(self.out_dir, 'summary.json'), 'w') as f:
+            json.dump(self.results, f, indent=2)
+        out = io.StringIO()
+        for name, r in sorted(self.results.items(), key=lambda kv: -kv[1]['wall_seconds']):
+            buckets = ', '.join(f"{k} {v:.2f}s" for k, v in r['buckets_seconds'].items() if v)
+            out.write(f"{name}: {r['wall_seconds']:.2f}s wall, {r['peak_memory_mb']:.1f} MB peak\n")
+            if buckets:
+                out.write(f"  {buckets}\n")
+            for fn in r['top_functions']:
+                out.write(f"  {fn['own_seconds']:8.4f}s own {fn['cum_seconds']:8.4f}s cum "
+                          f"{fn['calls']:>8} calls  {fn['function']}\n")
+            out.write("\n")
+        text = out.getvalue()
+        with open(os.path.join(self.out_dir, 'summary.txt'), 'w') as f:
+            f.write(text)
+        return text
+
+def hottest(results: Dict[str, Dict], n: int = 5) -> List[str]:
+    """Scrapers ordered by wall time, for a one-line console report."""
+    ranked = sorted(results.items(), key=lambda kv: -kv[1]['wall_seconds'])[:n]
+    return [f"{name} {r['wall_seconds']:.2f}s" for name, r in ranked]
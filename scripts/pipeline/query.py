@@ -0,0 +1,260 @@
+import argparse
+import json
+import os
+import time
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+RANGE_FIELDS = ("rent", "bedrooms", "distance_from_campus_miles")
+FACET_FIELDS = ("neighborhood", "lease_term", "heating_type")
+# Largest page of results a request may ask for
+MAX_K = 100
+
+# Sorted positions between stored prefix bitmaps; a range touches at most 2 * this many ids one by one
+PREFIX_BLOCK = 256
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+def _bits_of(ids: Iterable[int], n: int) -> int:
+    """Bitmap with the given row ids set, built in a bytearray rather than by big-int ORs."""
+    buf = bytearray((n + 7) >> 3)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+def _ids_of(bits: int, n: int) -> List[int]:
+    """Row ids set in a bitmap, in id order."""
+    buf = bits.to_bytes((n + 7) >> 3, "little")
+    return [(j << 3) + b for j, byte in enumerate(buf) if byte for b in range(8) if byte >> b & 1]
+
+class SortedIndex:
+    """Row ids ordered by a numeric field, for range filters and ordered top-k.
+
+    Every PREFIX_BLOCK sorted positions a bitmap of all ids before that
+    position is kept, so a range is two prefix bitmaps XORed plus at most two
+    partial blocks, however wide the range.
+    """
+
+    def __init__(self, rows: List[Dict], field: str):
+        pairs = sorted((row[field], i) for i, row in enumerate(rows) if row.get(field) is not None)
+        self.values = [v for v, _ in pairs]
+        self.ids = [i for _, i in pairs]
+        self.n = len(rows)
+        self.prefix = [0]
+        buf = bytearray((self.n + 7) >> 3)
+        for pos, i in enumerate(self.ids, 1):
+            buf[i >> 3] |= 1 << (i & 7)
+            if pos % PREFIX_BLOCK == 0:
+                self.prefix.append(int.from_bytes(buf, "little"))
+
+    def _prefix_bits(self, pos: int) -> int:
+        """Bitmap of ids at sorted positions [0, pos)."""
+        block = pos // PREFIX_BLOCK
+        return self.prefix[block] ^ _bits_of(self.ids[block * PREFIX_BLOCK:pos], self.n)
+
+    def range_bits(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        lo = 0 if low is None else bisect_left(self.values, low)
+        hi = len(self.values) if high is None else bisect_right(self.values, high)
+        if lo >= hi:
+            return 0
+        return self._prefix_bits(hi) ^ self._prefix_bits(lo)
+
+class ListingIndex:
+    """Warm in-memory search over scraped listings.
+
+    Numeric fields get sorted indexes and categorical fields get one bitmap
+    (a Python int, bit i = row i) per value, so a multi-filter query is a few
+    bisects and ANDs, and facet counts are popcounts.
+    """
+
+    def __init__(self, rows: List[Dict]):
+        self.rows = rows
+        self.all_bits = (1 << len(rows)) - 1
+        self.sorted = {field: SortedIndex(rows, field) for field in RANGE_FIELDS}
+        self.bitmaps: Dict[str, Dict[str, int]] = {}
+        for field in FACET_FIELDS:
+            ids: Dict[str, List[int]] = {}
+            for i, row in enumerate(rows):
+                value = row.get(field)
+                if value is not None:
+                    ids.setdefault(value, []).append(i)
+            self.bitmaps[field] = {value: _bits_of(value_ids, len(rows)) for value, value_ids in ids.items()}
+
+    @classmethod
+    def load(cls, path: str) -> "ListingIndex":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def filter_bits(self, filters: Dict) -> Tuple[int, Dict[str, int]]:
+        """(bitmap of rows passing every range filter, allowed-rows bitmap per filtered facet).
+
+        Range filters are <field>_min/<field>_max; facet filters take a value or
+        a list of accepted values.
+        """
+        ranges = self.all_bits
+        for field in RANGE_FIELDS:
+            low, high = filters.get(f"{field}_min"), filters.get(f"{field}_max")
+            if low is not None or high is not None:
+                ranges &= self.sorted[field].range_bits(low, high)
+        facets = {}
+        for field in FACET_FIELDS:
+            wanted = filters.get(field)
+            if wanted is None:
+                continue
+            if isinstance(wanted, str):
+                wanted = [wanted]
+            allowed = 0
+            for value in wanted:
+                allowed |= self.bitmaps[field].get(value, 0)
+            facets[field] = allowed
+        return ranges, facets
+
+    def match(self, filters: Dict) -> int:
+        """Bitmap of rows matching every filter."""
+        bits, facets = self.filter_bits(filters)
+        for allowed in facets.values():
+            bits &= allowed
+        return bits
+
+    def facets(self, filters: Dict, parts: Optional[Tuple[int, Dict[str, int]]] = None) -> Dict[str, Dict[str, int]]:
+        """Counts per facet value, each computed with every filter except its own."""
+        ranges, allowed = parts or self.filter_bits(filters)
+        counts = {}
+        for field in FACET_FIELDS:
+            bits = ranges
+            for other, mask in allowed.items():
+                if other != field:
+                    bits &= mask
+            counts[field] = {
+                value: n for value, bitmap in self.bitmaps[field].items() if (n := _popcount(bits & bitmap))
+            }
+        return counts
+
+    def top(self, bits: int, k: int = 20, sort: str = "rent", descending: bool = False) -> List[Dict]:
+        """First k matching rows in sort order; rows missing the sort field come last."""
+        if k <= 0:
+            return []
+        index = self.sorted[sort]
+        order: Iterable[int] = reversed(index.ids) if descending else index.ids
+        # Test membership in bytes; shifting the big int per row would be O(n) each
+        buf = bits.to_bytes((len(self.rows) + 7) >> 3, "little")
+        result = []
+        for i in order:
+            if buf[i >> 3] >> (i & 7) & 1:
+                result.append(self.rows[i])
+                if len(result) == k:
+                    return result
+        missing = bits & ~index.range_bits()
+        for i in _ids_of(missing, len(self.rows))[:k - len(result)]:
+            result.append(self.rows[i])
+        return result
+
+    def search(self, filters: Dict, k: int = 20, sort: str = "rent", descending: bool = False) -> Dict:
+        parts = self.filter_bits(filters)
+        bits = parts[0]
+        for allowed in parts[1].values():
+            bits &= allowed
+        return {
+            "total": _popcount(bits),
+            "results": self.top(bits, k, sort, descending),
+            "facets": self.facets(filters, parts),
+        }
+
+class WarmIndex:
+    """ListingIndex that rebuilds itself when the scraped file changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = None
+        self.index: Optional[ListingIndex] = None
+
+    def get(self) -> ListingIndex:
+        mtime = os.path.getmtime(self.path)
+        if self.index is None or mtime != self.mtime:
+            self.index = ListingIndex.load(self.path)
+            self.mtime = mtime
+        return self.index
+
+def parse_k(params: Dict[str, List[str]], default: int = 20) -> int:
+    """Result count from the query string: at least 1, capped at MAX_K."""
+    k = int(params.get("k", [str(default)])[0])
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    return min(k, MAX_K)
+
+def parse_filters(params: Dict[str, List[str]]) -> Dict:
+    """Query-string parameters (as from parse_qs) to ListingIndex filters."""
+    filters = {}
+    for field in RANGE_FIELDS:
+        for bound in ("min", "max"):
+            key = f"{field}_{bound}"
+            if key in params:
+                filters[key] = float(params[key][0])
+    for field in FACET_FIELDS:
+        if field in params:
+            filters[field] = [v for value in params[field] for v in value.split(",")]
+    return filters
+
+def serve(path: str, host: str = "127.0.0.1", port: int = 8765):
+    warm = WarmIndex(path)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/search":
+                self.send_error(404)
+                return
+            params = parse_qs(url.query)
+            try:
+                filters = parse_filters(params)
+                k = parse_k(params)
+                sort = params.get("sort", ["rent"])[0]
+                if sort not in RANGE_FIELDS:
+                    raise ValueError(f"sort must be one of {', '.join(RANGE_FIELDS)}")
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            start = time.perf_counter()
+            result = warm.get().search(filters, k, sort, params.get("order", ["asc"])[0] == "desc")
+            result["took_us"] = round((time.perf_counter() - start) * 1e6)
+            body = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    print(f"Serving {path} on http://{host}:{port}/search")
+    ThreadingHTTPServer((host, port), Handler).serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search scraped listings from an in-memory index.")
+    parser.add_argument('--input', default='scripts/data/scraped_listings.json')
+    parser.add_argument('--serve', action='store_true', help='Run a local HTTP endpoint at /search')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('query', nargs='?', default='',
+                        help='Query string, e.g. "rent_max=1500&bedrooms_min=2&neighborhood=Collegetown"')
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.input, port=args.port)
+        return
+    params = parse_qs(args.query)
+    try:
+        filters, k = parse_filters(params), parse_k(params, default=10)
+    except ValueError as e:
+        parser.error(str(e))
+    index = ListingIndex.load(args.input)
+    start = time.perf_counter()
+    result = index.search(filters, k)
+    took = (time.perf_counter() - start) * 1e6
+    print(f"{result['total']} matches in {took:.0f} us")
+    for row in result["results"]:
+        print(f"  ${row['rent']:>5}  {row['bedrooms']}bd  {row['neighborhood']:12} {row['title']}")
+    print(json.dumps(result["facets"], indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import argparse
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Listings scored more than this many robust standard deviations from the model are flagged
+Z_THRESHOLD = 3.5
+# Fewer priced listings than this and the fit is too noisy to judge anything
+MIN_TRAIN = 20
+RIDGE = 1.0
+HUBER_K = 1.345
+ROBUST_ITERATIONS = 5
+MAX_BEDROOMS = 8
+
+class RentModel:
+    """Hedonic model of log rent on bedrooms, bathrooms, neighborhood and distance.
+
+    Fitted by ridge-regularized least squares, reweighted a few times with
+    Huber weights so the wrong prices it is meant to catch (deposits, fees,
+    per-bedroom rents) don't drag the fit. Scores are residuals in units of
+    the residuals' median absolute deviation.
+    """
+
+    def __init__(self, z_threshold: float = Z_THRESHOLD, ridge: float = RIDGE):
+        self.z_threshold = z_threshold
+        self.ridge = ridge
+        self.neighborhoods: List[str] = []
+        self.coef: Optional[np.ndarray] = None
+        self.scale = 1.0
+        self.fill_distance = 0.0
+        self.n_train = 0
+
+    def _features(self, rows: List[Dict]) -> np.ndarray:
+        n = len(rows)
+        distance = np.array([np.nan if r.get('distance_from_campus_miles') is None
+                             else r['distance_from_campus_miles'] for r in rows], dtype=float)
+        missing = np.isnan(distance)
+        codes = {name: i for i, name in enumerate(self.neighborhoods)}
+        hood = np.array([codes.get(r.get('neighborhood'), -1) for r in rows])
+
+        X = np.zeros((n, 5 + len(self.neighborhoods)))
+        X[:, 0] = 1.0
+        X[:, 1] = np.clip([r.get('bedrooms') or 0 for r in rows], 0, MAX_BEDROOMS)
+        X[:, 2] = [r.get('bathrooms') or 0 for r in rows]
+        X[:, 3] = np.where(missing, self.fill_distance, distance)
+        X[:, 4] = missing
+        # Unseen neighborhoods get no indicator, i.e. the average neighborhood under the ridge penalty
+        seen = hood >= 0
+        X[np.flatnonzero(seen), 5 + hood[seen]] = 1.0
+        return X
+
+    def fit(self, listings: Iterable) -> "RentModel":
+        rows = [l if isinstance(l, dict) else vars(l) for l in listings]
+        rows = [r for r in rows if (r.get('rent') or 0) > 0]
+        self.n_train = len(rows)
+        if self.n_train < MIN_TRAIN:
+            self.coef = None
+            return self
+
+        self.neighborhoods = sorted({r.get('neighborhood') for r in rows if r.get('neighborhood')})
+        known = [r['distance_from_campus_miles'] for r in rows if r.get('distance_from_campus_miles') is not None]
+        self.fill_distance = float(np.median(known)) if known else 0.0
+        X = self._features(rows)
+        y = np.log(np.array([r['rent'] for r in rows], dtype=float))
+
+        penalty = np.full(X.shape[1], self.ridge)
+        penalty[0] = 0.0 # intercept is not shrunk
+        weights = np.ones(len(y))
+        for _ in range(ROBUST_ITERATIONS):
+            Xw = X * weights[:, None]
+            coef = np.linalg.solve(X.T @ Xw + np.diag(penalty), Xw.T @ y)
+            resid = y - X @ coef
+            scale = 1.4826 * np.median(np.abs(resid - np.median(resid))) or 1e-6
+            u = np.abs(resid) / (HUBER_K * scale)
+            weights = np.where(u <= 1, 1.0, 1.0 / np.maximum(u, 1e-12))
+        self.coef = coef
+        self.scale = scale
+        return self
+
+    @property
+    def fitted(self) -> bool:
+        return self.coef is not None
+
+    def score(self, listings: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """(estimated rent, z-score of the scraped rent) per listing; z is NaN where rent <= 0."""
+        rows = [l if isinstance(l, dict) else vars(l) for l in listings]
+        if not self.fitted:
+            raise ValueError(f"Not fitted: only {self.n_train} priced listings (need {MIN_TRAIN})")
+        log_estimate = self._features(rows) @ self.coef
+        rent = np.array([r.get('rent') or 0 for r in rows], dtype=float)
+        priced = rent > 0
+        z = np.full(len(rows), np.nan)
+        z[priced] = (np.log(rent[priced]) - log_estimate[priced]) / self.scale
+        return np.exp(log_estimate), z
+
+    def attach(self, listings: List, impute: bool = False) -> Dict[str, int]:
+        """Set rent_estimate and rent_flag on each listing. Returns counts per flag.
+
+        Flags are 'placeholder' (no rent), 'too_low' and 'too_high'. With
+        impute, too_low/too_high rents are replaced by the estimate and the flag
+        gets an '_imputed' suffix so it is never mistaken for a scraped price.
+        Placeholders keep rent=0: an estimate alone is no basis for a listing's
+        price, so they stay quarantined by the validator.
+        """
+        rows = [l if isinstance(l, dict) else vars(l) for l in listings]
+        counts: Dict[str, int] = {}
+        if not rows or not self.fitted:
+            return counts
+        estimate, z = self.score(rows)
+        flags = np.full(len(rows), None, dtype=object)
+        flags[np.isnan(z)] = 'placeholder'
+        flags[z < -self.z_threshold] = 'too_low'
+        flags[z > self.z_threshold] = 'too_high'
+        for row, est, flag in zip(rows, np.round(estimate, -1), flags):
+            row['rent_estimate'] = float(est)
+            if flag in ('too_low', 'too_high') and impute:
+                row['rent'] = int(est)
+                flag += '_imputed'
+            row['rent_flag'] = flag
+            if flag:
+                counts[flag] = counts.get(flag, 0) + 1
+        return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate rents and flag placeholder or anomalous prices.")
+    parser.add_argument('--input', default='scripts/data/scraped_listings.json')
+    parser.add_argument('--output', help='Defaults to updating --input in place')
+    parser.add_argument('--impute', action='store_true', help='Replace too_low/too_high rents with the estimate')
+    parser.add_argument('--threshold', type=float, default=Z_THRESHOLD)
+    parser.add_argument('--show', type=int, default=10, help='Print the N most anomalous listings')
+    args = parser.parse_args(argv)
+
+    with open(args.input) as f:
+        data = json.load(f)
+
+    start = time.perf_counter()
+    model = RentModel(args.threshold).fit(data)
+    if not model.fitted:
+        print(f"Only {model.n_train} priced listings; need {MIN_TRAIN} to fit")
+        return
+    _, z = model.score(data)
+    scraped = [d.get('rent') for d in data]
+    counts = model.attach(data, impute=args.impute)
+    elapsed = time.perf_counter() - start
+    print(f"Fit on {model.n_train} listings and scored {len(data)} in {elapsed * 1000:.1f} ms: {counts or 'nothing flagged'}")
+
+    for i in np.argsort(-np.nan_to_num(np.abs(z)))[:args.show]:
+        if np.isnan(z[i]) or abs(z[i]) <= args.threshold:
+            break
+        d = data[i]
+        print(f"  z={z[i]:+5.1f}  ${scraped[i]} vs ~${d['rent_estimate']:.0f}  {d['title']}  {d['url']}")
+
+    with open(args.output or args.input, 'w') as f:
+        json.dump(data, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_DB = 'scripts/data/schedule.sqlite'
+
+HOUR = 3600
+MIN_INTERVAL = 2 * HOUR
+MAX_INTERVAL = 14 * 24 * HOUR
+DEFAULT_INTERVAL = 24 * HOUR
+# Multiplicative backoff: halve the interval after a change, stretch it after a quiet run
+SHRINK = 0.5
+GROW = 1.5
+# A failed scrape is retried after this, doubling per consecutive failure up to the source's interval
+RETRY_DELAY = 15 * 60
+
+SCHEMA = """
+create table if not exists sources (
+  slug text primary key,
+  interval real not null,
+  next_due real not null,
+  last_run real,
+  runs integer not null default 0,
+  changes integer not null default 0,
+  failures integer not null default 0,
+  fingerprint text
+);
+
+create table if not exists urls (
+  url text primary key,
+  source text not null,
+  fingerprint text not null,
+  listing text not null,
+  interval real not null,
+  next_due real not null,
+  last_changed real,
+  checks integer not null default 0,
+  changes integer not null default 0
+);
+
+create index if not exists urls_source_due on urls (source, next_due);
+"""
+
+def fingerprint(listing: Dict) -> str:
+    """Hash of the fields that matter; created_at is stamped fresh every run."""
+    content = {k: v for k, v in listing.items() if k != 'created_at'}
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+def _next_interval(interval: float, changed: bool) -> float:
+    return min(MAX_INTERVAL, max(MIN_INTERVAL, interval * (SHRINK if changed else GROW)))
+
+class RefreshScheduler:
+    """Per-source and per-URL refresh intervals learned from how often output changes.
+
+    Every time a source (or a single detail URL) is scraped its output is
+    fingerprinted. A change halves that interval, no change stretches it by
+    half, within [MIN_INTERVAL, MAX_INTERVAL]. The latest listing for every URL
+    is kept, so a run that refreshes only some sources can still write out the
+    complete set.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('pragma journal_mode=wal')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def due_sources(self, slugs: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Slugs whose interval has elapsed; sources never run before are always due."""
+        now = now or time.time()
+        due = []
+        for slug in slugs:
+            row = self.conn.execute('select next_due from sources where slug = ?', (slug,)).fetchone()
+            if row is None or row[0] <= now:
+                due.append(slug)
+        return due
+
+    def due_urls(self, slug: str, now: Optional[float] = None, limit: int = 50) -> List[str]:
+        now = now or time.time()
+        cur = self.conn.execute(
+            'select url from urls where source = ? and next_due <= ? order by next_due limit ?', (slug, now, limit)
+        )
+        return [url for (url,) in cur]
+
+    def next_due(self, slugs: Iterable[str], url_slugs: Iterable[str] = ()) -> Optional[float]:
+        """Earliest time one of these sources, or a URL of one of url_slugs, becomes due.
+
+        Sources never run before count as due now. Only pass url_slugs for
+        sources whose URLs are actually refreshed one at a time, or their due
+        URLs would keep the answer in the past.
+        """
+        slugs, url_slugs = list(slugs), list(url_slugs)
+        times = []
+        if slugs:
+            marks = ','.join('?' * len(slugs))
+            known = self.conn.execute(
+                f'select count(*), min(next_due) from sources where slug in ({marks})', slugs
+            ).fetchone()
+            times.append(time.time() if known[0] < len(slugs) else known[1])
+        if url_slugs:
+            marks = ','.join('?' * len(url_slugs))
+            times.append(self.conn.execute(
+                f'select min(next_due) from urls where source in ({marks})', url_slugs
+            ).fetchone()[0])
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
+
+    def record_failure(self, slug: str, now: Optional[float] = None) -> float:
+        """Push a source that failed (or came back empty) back with exponential backoff.
+
+        Its stored listings and interval are left alone. Returns the delay.
+        """
+        now = now or time.time()
+        with self.conn:
+            row = self.conn.execute('select interval, failures from sources where slug = ?', (slug,)).fetchone()
+            interval, failures = row if row else (DEFAULT_INTERVAL, 0)
+            delay = min(RETRY_DELAY * 2 ** failures, max(interval, RETRY_DELAY))
+            self.conn.execute("""
+                insert into sources (slug, interval, next_due, failures) values (?, ?, ?, 1)
+                on conflict (slug) do update set next_due = excluded.next_due, failures = failures + 1
+            """, (slug, interval, now + delay))
+        return delay
+
+    def record_source(self, slug: str, listings: List[Dict], now: Optional[float] = None,
+                      failed_urls: Iterable[str] = ()) -> bool:
+        """Record a full scrape of a source. Returns whether its output changed.
+
+        The scrapers swallow fetch errors and return nothing, so an empty
+        scrape is recorded as a failure rather than as every listing gone.
+        Stored listings for failed_urls (pages that didn't fetch) are kept.
+        """
+        now = now or time.time()
+        prints = {l['url']: fingerprint(l) for l in listings if l.get('url')}
+        if not prints:
+            self.record_failure(slug, now)
+            return False
+        source_print = hashlib.sha1(json.dumps(sorted(prints.items())).encode()).hexdigest()
+        with self.conn:
+            row = self.conn.execute('select interval, fingerprint from sources where slug = ?', (slug,)).fetchone()
+            if row is None or row[1] is None:
+                changed, interval = True, DEFAULT_INTERVAL
+            else:
+                changed = row[1] != source_print
+                interval = _next_interval(row[0], changed)
+            self.conn.execute("""
+                insert into sources (slug, interval, next_due, last_run, runs, changes, failures, fingerprint)
+                values (?, ?, ?, ?, 1, ?, 0, ?)
+                on conflict (slug) do update set
+                  interval = excluded.interval, next_due = excluded.next_due, last_run = excluded.last_run,
+                  runs = runs + 1, changes = changes + excluded.changes, failures = 0,
+                  fingerprint = excluded.fingerprint
+            """, (slug, interval, now + interval, now, int(changed), source_print))
+
+            for listing in listings:
+                if listing.get('url'):
+                    self._record_url(slug, listing, prints[listing['url']], now)
+            # Listings the source no longer returns are gone
+            keep = set(prints) | set(failed_urls)
+            placeholders = ','.join('?' * len(keep))
+            self.conn.execute(
+                f'delete from urls where source = ? and url not in ({placeholders})', (slug, *keep)
+            )
+        return changed
+
+    def record_url(self, slug: str, url: str, listing: Optional[Dict], now: Optional[float] = None) -> bool:
+        """Record a re-scrape of one detail page. Returns whether it changed."""
+        now = now or time.time()
+        with self.conn:
+            if listing is None:
+                # A failed fetch and a removed page look the same here; keep the old copy
+                # and let the source's next full scrape decide whether it is gone
+                self.conn.execute('update urls set next_due = ? + interval where url = ?', (now, url))
+                return False
+            return self._record_url(slug, listing, fingerprint(listing), now)
+
+    def _record_url(self, slug: str, listing: Dict, url_print: str, now: float) -> bool:
+        url = listing['url']
+        row = self.conn.execute('select interval, fingerprint from urls where url = ?', (url,)).fetchone()
+        if row is None:
+            changed, interval = True, DEFAULT_INTERVAL
+        else:
+            changed = row[1] != url_print
+            interval = _next_interval(row[0], changed)
+        self.conn.execute("""
+            insert into urls (url, source, fingerprint, listing, interval, next_due, last_changed, checks, changes)
+            values (?, ?, ?, ?, ?, ?, ?, 1, 1)
+            on conflict (url) do update set
+              source = excluded.source, fingerprint = excluded.fingerprint, listing = excluded.listing,
+              interval = excluded.interval, next_due = excluded.next_due,
+              last_changed = case when ? then excluded.last_changed else last_changed end,
+              checks = checks + 1, changes = changes + ?
+        """, (url, slug, url_print, json.dumps(listing), interval, now + interval, now, changed, int(changed)))
+        return changed
+
+    def source_urls(self, slug: str) -> List[str]:
+        return [url for (url,) in self.conn.execute('select url from urls where source = ?', (slug,))]
+
+    def listings(self) -> List[Dict]:
+        """Latest known listing for every URL, grouped by source."""
+        cur = self.conn.execute('select listing from urls order by source, rowid')
+        return [json.loads(listing) for (listing,) in cur]
+
+    def report(self) -> List[Dict]:
+        cur = self.conn.execute(
+            'select slug, interval, next_due, runs, changes, failures from sources order by interval'
+        )
+        return [
+            {'source': slug, 'interval_hours': round(interval / HOUR, 1), 'next_due': next_due,
+             'runs': runs, 'changes': changes, 'failures': failures}
+            for slug, interval, next_due, runs, changes, failures in cur
+        ]
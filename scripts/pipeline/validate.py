@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'supabase', 'schema.sql')
+DEFAULT_REJECTS = 'scripts/data/rejected_listings.json'
+
+# Spellings scrapers produce for enum values, after lowercasing and squashing spaces/dashes
+ENUM_ALIASES: Dict[str, Dict[str, str]] = {
+    "neighborhood_enum": {"college town": "Collegetown", "fallcreek": "Fall Creek", "downtown ithaca": "Downtown"},
+    "lease_term_enum": {"12 month": "12-month", "12 months": "12-month", "1 year": "12-month", "annual": "12-month",
+                        "10 month": "10-month", "10 months": "10-month", "11 month": "11-month",
+                        "11 months": "11-month", "sublease": "Sublet", "sublet": "Sublet"},
+    "heating_type_enum": {"electric": "Electric Baseboard", "baseboard": "Electric Baseboard",
+                          "natural gas": "Gas", "radiator": "Steam", "": "Unknown"},
+}
+# Enums with a safe catch-all value; any other unknown enum value quarantines the row
+ENUM_FALLBACKS = {"heating_type_enum": "Unknown"}
+
+NUMERIC_TYPES = {"integer", "numeric", "double precision"}
+
+class Column:
+    def __init__(self, name: str, sql_type: str, not_null: bool):
+        self.name = name
+        self.sql_type = sql_type
+        self.not_null = not_null
+
+    def __repr__(self) -> str:
+        return f"Column({self.name!r}, {self.sql_type!r}, not_null={self.not_null})"
+
+def load_schema(path: str = SCHEMA_PATH, table: str = "listings") -> Tuple[Dict[str, Column], Dict[str, List[str]]]:
+    """Columns of the table and all enum types, parsed from schema.sql."""
+    with open(path) as f:
+        sql = f.read()
+    enums = {
+        name: re.findall(r"'([^']*)'", values)
+        for name, values in re.findall(r"create type (\w+) as enum \((.*?)\);", sql, re.S | re.I)
+    }
+    body = re.search(rf"create table if not exists {table} \((.*?)\n\);", sql, re.S | re.I)
+    if not body:
+        raise ValueError(f"Table {table} not found in {path}")
+    columns = {}
+    for line in body.group(1).splitlines():
+        line = line.split('--')[0].strip().rstrip(',')
+        match = re.match(r"(\w+)\s+(double precision|\w+(?:\[\])?)(.*)", line)
+        if not match or match.group(1).lower() in ("primary", "unique", "constraint", "foreign", "check"):
+            continue
+        name, sql_type, rest = match.groups()
+        columns[name] = Column(name, sql_type.lower(), "not null" in rest.lower())
+    return columns, enums
+
+def _enum_lookup(values: List[str], aliases: Dict[str, str]) -> Dict[str, str]:
+    lookup = {re.sub(r"[\s_-]+", " ", v.lower()).strip(): v for v in values}
+    lookup.update(aliases)
+    return lookup
+
+class Validator:
+    """Checks scraped rows against the listings table before they are uploaded.
+
+    Works a column at a time: numeric columns become numpy arrays checked with
+    masks, enum columns are mapped through one lookup table each. Rows that can
+    be fixed are coerced in place; the rest are returned as rejects with reasons.
+    """
+
+    def __init__(self, schema_path: str = SCHEMA_PATH):
+        self.columns, self.enums = load_schema(schema_path)
+        self.lookups = {
+            name: _enum_lookup(values, ENUM_ALIASES.get(name, {})) for name, values in self.enums.items()
+        }
+
+    def validate(self, rows: List[Dict], columns: Optional[List[str]] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Split rows into (valid, rejects). Only columns present in the rows are checked."""
+        n = len(rows)
+        reasons: List[List[str]] = [[] for _ in range(n)]
+        if not n:
+            return [], []
+        present = set().union(*(r.keys() for r in rows))
+        columns = [c for c in (columns or self.columns) if c in present]
+
+        for name in columns:
+            column = self.columns[name]
+            values = [r.get(name) for r in rows]
+            if column.sql_type in NUMERIC_TYPES:
+                self._check_numeric(rows, column, values, reasons)
+            elif column.sql_type in self.enums:
+                self._check_enum(rows, column, values, reasons)
+            elif column.sql_type == "text":
+                for i, v in enumerate(values):
+                    if v is None:
+                        if column.not_null:
+                            reasons[i].append(f"{name} is null")
+                    elif not isinstance(v, str):
+                        rows[i][name] = str(v)
+                    elif column.not_null and not v.strip():
+                        reasons[i].append(f"{name} is empty")
+            elif column.sql_type == "text[]":
+                for i, v in enumerate(values):
+                    if v is None:
+                        continue
+                    if not isinstance(v, list):
+                        reasons[i].append(f"{name} is not a list")
+                    else:
+                        rows[i][name] = [str(x) for x in v if x]
+            elif column.sql_type == "boolean":
+                for i, v in enumerate(values):
+                    if v is not None and not isinstance(v, bool):
+                        rows[i][name] = bool(v)
+
+        # listings.url is unique and uploads upsert on it; a repeated URL fails the whole batch
+        if "url" in present:
+            seen = set()
+            for i, r in enumerate(rows):
+                url = r.get("url")
+                if url in seen:
+                    reasons[i].append("duplicate url")
+                seen.add(url)
+
+        valid, rejects = [], []
+        for row, why in zip(rows, reasons):
+            if why:
+                rejects.append({"reasons": why, "listing": row})
+            else:
+                valid.append(row)
+        return valid, rejects
+
+    def _check_numeric(self, rows, column, values, reasons):
+        name = column.name
+        missing = np.array([v is None for v in values])
+        try:
+            arr = np.array([np.nan if v is None else v for v in values], dtype=float)
+        except (TypeError, ValueError):
+            arr = np.array([_to_float(v) for v in values], dtype=float)
+        bad = ~missing & ~np.isfinite(arr)
+        if column.not_null:
+            bad |= missing
+        if name == "rent":
+            # rent=0 is the "unknown/variable" placeholder some scrapers emit
+            bad |= ~missing & (arr <= 0)
+        elif name in ("bedrooms", "bathrooms", "distance_from_campus_miles"):
+            bad |= ~missing & (arr < 0)
+        elif name == "latitude":
+            bad |= ~missing & (np.abs(arr) > 90)
+        elif name == "longitude":
+            bad |= ~missing & (np.abs(arr) > 180)
+        for i in np.flatnonzero(bad):
+            v = values[i]
+            reasons[i].append(f"{name} is null" if v is None else
+                              "placeholder rent" if name == "rent" and arr[i] == 0 else
+                              f"{name} out of range: {v!r}")
+        if column.sql_type == "integer":
+            ok = ~missing & ~bad
+            # Coerce floats and numeric strings the scrapers sometimes produce
+            for i in np.flatnonzero(ok & (arr != np.round(arr))):
+                reasons[i].append(f"{name} is not an integer: {values[i]!r}")
+            for i in np.flatnonzero(ok & (arr == np.round(arr))):
+                if not isinstance(values[i], int) or isinstance(values[i], bool):
+                    rows[i][name] = int(arr[i])
+        else:
+            for i in np.flatnonzero(~missing & ~bad):
+                if not isinstance(values[i], (int, float)) or isinstance(values[i], bool):
+                    rows[i][name] = float(arr[i])
+
+    def _check_enum(self, rows, column, values, reasons):
+        name, enum = column.name, column.sql_type
+        allowed = set(self.enums[enum])
+        lookup = self.lookups[enum]
+        fallback = ENUM_FALLBACKS.get(enum)
+        for i, v in enumerate(values):
+            if v in allowed:
+                continue
+            if v is None and not column.not_null:
+                continue
+            key = re.sub(r"[\s_-]+", " ", str(v or "").lower()).strip()
+            coerced = lookup.get(key, fallback)
+            if coerced is None:
+                reasons[i].append(f"{name} not in {enum}: {v!r}")
+            else:
+                rows[i][name] = coerced
+
+def _to_float(value) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(str(value).replace(',', '').replace('$', ''))
+    except ValueError:
+        return np.nan
+
+def write_rejects(rejects: List[Dict], path: str = DEFAULT_REJECTS):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(rejects, f, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate scraped listings against supabase/schema.sql.")
+    parser.add_argument('--input', default='scripts/data/scraped_listings.json')
+    parser.add_argument('--output', help='Defaults to updating --input in place')
+    parser.add_argument('--rejects', default=DEFAULT_REJECTS)
+    args = parser.parse_args(argv)
+
+    with open(args.input) as f:
+        data = json.load(f)
+    valid, rejects = Validator().validate(data)
+    with open(args.output or args.input, 'w') as f:
+        json.dump(valid, f, indent=2)
+    write_rejects(rejects, args.rejects)
+    print(f"{len(valid)} valid, {len(rejects)} quarantined -> {args.rejects}")
+
+if __name__ == "__main__":
+    main()
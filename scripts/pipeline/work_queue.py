@@ -0,0 +1,248 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+DEFAULT_DB = 'scripts/data/work_queue.sqlite'
+
+SCHEMA = """
+create table if not exists tasks (
+  id integer primary key,
+  run_id text not null,
+  scraper text not null,
+  kind text not null check (kind in ('source', 'detail')),
+  url text not null default '',
+  status text not null default 'pending'
+    check (status in ('pending', 'leased', 'done', 'dead')),
+  attempts integer not null default 0,
+  lease_owner text,
+  lease_expires real,
+  last_error text,
+  unique (run_id, scraper, kind, url)
+);
+
+create index if not exists tasks_claim on tasks (run_id, status, lease_expires);
+
+create table if not exists results (
+  task_id integer primary key references tasks(id),
+  listings text not null
+);
+
+create table if not exists hosts (
+  host text primary key,
+  next_at real not null
+);
+"""
+
+class WorkQueue:
+    """Durable (scraper, URL) task queue on SQLite in WAL mode.
+
+    Each run starts with one 'source' task per scraper. A worker that claims a
+    source task calls discover_urls(); scrapers that can be split fan out into
+    one 'detail' task per URL, the rest are scraped whole by that worker.
+    Claims are leases: a worker that dies leaves its task to be re-claimed once
+    the lease expires. Failed tasks are retried with exponential backoff and
+    dead-lettered after max_attempts.
+
+    All workers must share the database file, so processes on one host (or
+    hosts with a local-locking shared disk) can cooperate on a run.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB, lease_seconds: float = 120, max_attempts: int = 3,
+                 retry_delay: float = 5):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute('pragma journal_mode=wal')
+        self.conn.execute('pragma synchronous=normal')
+        self.conn.executescript(SCHEMA)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, run_id: str, scraper: str, kind: str = 'source', urls: Iterable[str] = ('',)):
+        self.conn.execute('begin immediate')
+        try:
+            self.conn.executemany(
+                'insert or ignore into tasks (run_id, scraper, kind, url) values (?, ?, ?, ?)',
+                [(run_id, scraper, kind, url) for url in urls]
+            )
+            self.conn.execute('commit')
+        except BaseException:
+            self.conn.execute('rollback')
+            raise
+
+    def claim(self, run_id: str) -> Optional[Dict]:
+        """Lease the next pending (or abandoned) task, or None if there is none right now."""
+        now = time.time()
+        self.conn.execute('begin immediate')
+        try:
+            # Abandoned leases that used up their attempts go to the dead letters
+            self.conn.execute("""
+                update tasks set status = 'dead', last_error = coalesce(last_error, 'lease expired')
+                where run_id = ? and status = 'leased' and lease_expires < ? and attempts >= ?
+            """, (run_id, now, self.max_attempts))
+            row = self.conn.execute("""
+                select id, scraper, kind, url, attempts from tasks
+                where run_id = ? and status in ('pending', 'leased') and coalesce(lease_expires, 0) < ?
+                order by kind = 'source' desc, id limit 1
+            """, (run_id, now)).fetchone()
+            if row:
+                self.conn.execute("""
+                    update tasks set status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                    where id = ?
+                """, (self.owner, now + self.lease_seconds, row[0]))
+            self.conn.execute('commit')
+        except BaseException:
+            self.conn.execute('rollback')
+            raise
+        if not row:
+            return None
+        return dict(zip(('id', 'scraper', 'kind', 'url', 'attempts'), row[:4] + (row[4] + 1,)))
+
+    # Only the lease this worker holds: a worker whose lease expired and was
+    # re-claimed must not overwrite the newer attempt's outcome
+    LEASE_MATCH = "id = ? and status = 'leased' and lease_owner = ? and attempts = ?"
+
+    def _lease(self, task: Dict) -> tuple:
+        return (task['id'], self.owner, task['attempts'])
+
+    def complete(self, task: Dict, listings: List[Dict]) -> bool:
+        """Store the task's results. False (and nothing stored) if the lease was lost."""
+        self.conn.execute('begin immediate')
+        try:
+            held = self.conn.execute(
+                f"update tasks set status = 'done', lease_expires = null where {self.LEASE_MATCH}", self._lease(task)
+            ).rowcount
+            if held:
+                self.conn.execute('insert or replace into results values (?, ?)', (task['id'], json.dumps(listings)))
+            self.conn.execute('commit')
+        except BaseException:
+            self.conn.execute('rollback')
+            raise
+        return bool(held)
+
+    def fail(self, task: Dict, error: str) -> bool:
+        """Return the task to the queue after a backoff, or dead-letter it. False if the lease was lost."""
+        status = 'dead' if task['attempts'] >= self.max_attempts else 'pending'
+        # For pending tasks lease_expires doubles as "not before"
+        retry_at = time.time() + self.retry_delay * 2 ** (task['attempts'] - 1)
+        held = self.conn.execute(
+            f"update tasks set status = ?, last_error = ?, lease_expires = ? where {self.LEASE_MATCH}",
+            (status, error, retry_at) + self._lease(task)
+        ).rowcount
+        return bool(held)
+
+    def throttle(self, host: str, delay: float) -> float:
+        """Wait for this host's next request slot, shared by every worker on the database.
+
+        Each call books the slot delay seconds after the previous booking, so N
+        workers together still send one request per delay to a host. Returns
+        the seconds slept.
+        """
+        if not delay:
+            return 0.0
+        now = time.time()
+        self.conn.execute('begin immediate')
+        try:
+            row = self.conn.execute('select next_at from hosts where host = ?', (host,)).fetchone()
+            slot = max(now, row[0]) if row else now
+            self.conn.execute('insert or replace into hosts values (?, ?)', (host, slot + delay))
+            self.conn.execute('commit')
+        except BaseException:
+            self.conn.execute('rollback')
+            raise
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    def pending(self, run_id: str) -> int:
+        """Tasks not yet done or dead, including ones leased by other workers."""
+        return self.conn.execute(
+            "select count(*) from tasks where run_id = ? and status in ('pending', 'leased')", (run_id,)
+        ).fetchone()[0]
+
+    def status(self, run_id: str) -> Dict[str, int]:
+        return dict(self.conn.execute(
+            'select status, count(*) from tasks where run_id = ? group by status', (run_id,)
+        ).fetchall())
+
+    def dead_letters(self, run_id: str) -> List[Dict]:
+        cur = self.conn.execute(
+            "select scraper, kind, url, attempts, last_error from tasks where run_id = ? and status = 'dead'",
+            (run_id,)
+        )
+        return [dict(zip(('scraper', 'kind', 'url', 'attempts', 'last_error'), row)) for row in cur]
+
+    def results(self, run_id: str) -> List[Dict]:
+        """All listings produced by a run, grouped by scraper in the order they were enqueued."""
+        listings = []
+        for scraper_listings in self.results_by_scraper(run_id).values():
+            listings.extend(scraper_listings)
+        return listings
+
+    def results_by_scraper(self, run_id: str) -> Dict[str, List[Dict]]:
+        """Listings per scraper slug, including scrapers that produced none."""
+        by_scraper: Dict[str, List[Dict]] = {
+            slug: [] for (slug,) in self.conn.execute(
+                "select scraper from tasks where run_id = ? and kind = 'source' order by id", (run_id,)
+            )
+        }
+        cur = self.conn.execute("""
+            select t.scraper, r.listings from results r
+            join tasks t on t.id = r.task_id
+            join tasks s on s.run_id = t.run_id and s.scraper = t.scraper and s.kind = 'source'
+            where t.run_id = ? order by s.id, t.id
+        """, (run_id,))
+        for scraper, payload in cur:
+            by_scraper[scraper].extend(json.loads(payload))
+        return by_scraper
+
+def run_worker(queue: WorkQueue, run_id: str) -> int:
+    """Process tasks until the run is drained. Returns the number of tasks handled."""
+    from scrapers import registry
+
+    scrapers = {}
+    handled = 0
+    while True:
+        task = queue.claim(run_id)
+        if task is None:
+            # Other workers may still hold leases that expire back to the queue
+            if queue.pending(run_id) == 0:
+                break
+            time.sleep(0.5)
+            continue
+
+        slug = task['scraper']
+        try:
+            if slug not in scrapers:
+                scrapers[slug] = registry.load_scraper(slug)
+            scraper = scrapers[slug]
+            if task['kind'] == 'source':
+                urls = scraper.discover_urls()
+                if urls is None:
+                    listings = [vars(l) for l in scraper.scrape()]
+                else:
+                    queue.enqueue(run_id, slug, 'detail', urls)
+                    listings = []
+                    print(f"[{queue.owner}] {slug}: queued {len(urls)} detail pages")
+            else:
+                queue.throttle(urlparse(task['url']).netloc, scraper.DETAIL_DELAY)
+                # FetchError (429, 5xx, timeouts) goes to queue.fail below and is retried
+                listing = scraper.scrape_details(task['url'])
+                listings = [vars(listing)] if listing else []
+            if not queue.complete(task, listings):
+                print(f"[{queue.owner}] {slug} {task['url']}: lease expired, result dropped")
+        except Exception as e:
+            print(f"[{queue.owner}] {slug} {task['url']} failed (attempt {task['attempts']}): {e}")
+            queue.fail(task, repr(e))
+        handled += 1
+    return handled
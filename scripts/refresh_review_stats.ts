@@ -0,0 +1,74 @@
+import { createClient } from '@supabase/supabase-js';
+import fs from 'fs';
+import path from 'path';
+
+// Helper to load env vars from .env.local
+function loadEnv() {
+    try {
+        const envPath = path.resolve(process.cwd(), '.env.local');
+        if (fs.existsSync(envPath)) {
+            const envConfig = fs.readFileSync(envPath, 'utf-8');
+            envConfig.split('\n').forEach((line) => {
+                const [key, value] = line.split('=');
+                if (key && value) {
+                    process.env[key.trim()] = value.trim().replace(/^["']|["']$/g, '');
+                }
+            });
+        }
+    } catch (e) {
+        console.error("Error loading .env.local:", e);
+    }
+}
+
+loadEnv();
+
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
+// The change log has no RLS policies, so only the service role can consume it
+const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
+
+if (!supabaseUrl || !supabaseKey) {
+    console.error("Missing Supabase credentials. Ensure NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are set in .env.local");
+    process.exit(1);
+}
+
+const supabase = createClient(supabaseUrl, supabaseKey, {
+    auth: {
+        autoRefreshToken: false,
+        persistSession: false
+    }
+});
+
+// Drain the review change log in batches, recomputing review_stats for the listings it names.
+// Run on a schedule (cron, or `--every <seconds>` to keep running).
+async function refresh() {
+    const batch = parseInt(process.env.REVIEW_STATS_BATCH || '10000');
+    let totalListings = 0;
+    let totalChanges = 0;
+
+    while (true) {
+        const { data, error } = await supabase.rpc('refresh_review_stats', { p_batch: batch });
+        if (error) {
+            console.error("Error refreshing review stats:", error.message);
+            process.exitCode = 1;
+            break;
+        }
+        const { listings, changes } = data?.[0] ?? { listings: 0, changes: 0 };
+        totalListings += listings;
+        totalChanges += changes;
+        if (changes < batch) break;
+    }
+
+    console.log(`Refreshed review stats for ${totalListings} listings from ${totalChanges} changes`);
+}
+
+async function main() {
+    const everyIndex = process.argv.indexOf('--every');
+    const every = everyIndex >= 0 ? parseInt(process.argv[everyIndex + 1]) : 0;
+    await refresh();
+    while (every > 0) {
+        await new Promise((resolve) => setTimeout(resolve, every * 1000));
+        await refresh();
+    }
+}
+
+main();
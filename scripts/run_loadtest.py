@@ -0,0 +1,216 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Add the current directory to path so we can import scrapers
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import requests
+
+from scrapers import registry
+from scrapers.single_building import SingleBuildingScraper
+from loadtest.fixtures import BASE_LISTINGS, FixtureSite
+from loadtest.server import FaultConfig, rewrite_url, start_in_process
+from run_scrapers import run_all_scrapers
+
+class RequestRecorder:
+    """Sends every requests call to the stand-in and times it, as the scraper saw it."""
+
+    def __init__(self, port: int, client_timeout: Optional[float] = None):
+        self.port = port
+        self.client_timeout = client_timeout
+        self.latencies: List[float] = []
+        self.outcomes: Counter = Counter()
+        self._original = requests.sessions.Session.request
+
+    def __enter__(self):
+        recorder, original = self, self._original
+
+        def request(session, method, url, *args, **kwargs):
+            if recorder.client_timeout and kwargs.get('timeout') is None:
+                kwargs['timeout'] = recorder.client_timeout
+            start = time.perf_counter()
+            outcome = 'error'
+            try:
+                response = original(session, method, rewrite_url(url, recorder.port), *args, **kwargs)
+                outcome = str(response.status_code)
+                return response
+            except requests.RequestException as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                recorder.latencies.append(time.perf_counter() - start)
+                recorder.outcomes[outcome] += 1
+
+        requests.sessions.Session.request = request
+        return self
+
+    def __exit__(self, *exc):
+        requests.sessions.Session.request = self._original
+
+class MemorySampler:
+    """Peak resident set size while a block runs, sampled every few milliseconds."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def rss() -> int:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except OSError:
+            # No procfs (macOS): fall back to the lifetime peak, which only grows
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.rss())
+
+    def __enter__(self):
+        self.baseline = self.peak = self.rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.rss())
+
+def _control(port: int, path: str) -> Dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/__loadtest/{path}") as response:
+        return json.load(response)
+
+def run_scale(scale: float, port: int, slugs: List[str], buildings: int,
+              client_timeout: Optional[float] = None) -> Dict:
+    """One full run_all_scrapers pass against the stand-in at the given scale."""
+    _control(port, f"reset?scale={scale}")
+    # A fresh working directory per run: outputs never touch the repo and the page cache starts cold
+    workdir = tempfile.mkdtemp(prefix=f"loadtest-{scale:g}x-")
+    log_path = os.path.join(workdir, 'run.log')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with open(log_path, 'w') as log, contextlib.redirect_stdout(log), \
+                RequestRecorder(port, client_timeout) as recorder, MemorySampler() as memory:
+            start = time.perf_counter()
+            run_all_scrapers(only=slugs, record_history=False)
+            wall = time.perf_counter() - start
+        with open('scripts/data/scraped_listings.json') as f:
+            valid = len(json.load(f))
+        with open('scripts/data/rejected_listings.json') as f:
+            rejected = len(json.load(f))
+    finally:
+        os.chdir(cwd)
+
+    latencies = np.array(recorder.latencies) * 1000
+    expected = FixtureSite(scale).expected_listings(slugs, buildings)
+    return {
+        'scale': scale,
+        'wall_seconds': round(wall, 2),
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / wall, 1) if wall else None,
+        'listings': valid,
+        'rejected': rejected,
+        'expected_listings': expected,
+        'completeness': round((valid + rejected) / expected, 3) if expected else None,
+        'listings_per_second': round(valid / wall, 1) if wall else None,
+        'latency_ms': {
+            name: round(float(np.percentile(latencies, q)), 1) if len(latencies) else None
+            for name, q in (('p50', 50), ('p95', 95), ('p99', 99), ('max', 100))
+        },
+        'client_outcomes': dict(recorder.outcomes),
+        'server_outcomes': _control(port, 'stats'),
+        'peak_rss_mb': round(memory.peak / 1e6, 1),
+        'rss_growth_mb': round((memory.peak - memory.baseline) / 1e6, 1),
+        'log': log_path,
+    }
+
+def print_report(results: List[Dict]):
+    print(f"\n{'scale':>6} {'wall s':>8} {'req':>7} {'req/s':>7} {'listings':>14} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>9} {'errors':>7} {'peak MB':>8}")
+    for r in results:
+        errors = sum(n for outcome, n in r['client_outcomes'].items() if outcome not in ('200', '304'))
+        lat = r['latency_ms']
+        print(f"{r['scale']:>5g}x {r['wall_seconds']:>8.1f} {r['requests']:>7} {r['requests_per_second']:>7} "
+              f"{r['listings']:>6}/{r['expected_listings']:<7} {lat['p50']:>8} {lat['p95']:>8} {lat['p99']:>8} "
+              f"{lat['max']:>9} {errors:>7} {r['peak_rss_mb']:>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the scrapers against a local, fault-injecting stand-in for every source at increasing scale."
+    )
+    parser.add_argument("--scales", nargs="+", type=float, default=[10, 25, 50, 100],
+                        help="Multiples of the usual page counts (default: 10 25 50 100)")
+    parser.add_argument("--only", nargs="+", metavar="SCRAPER")
+    parser.add_argument("--exclude", nargs="+", metavar="SCRAPER")
+    parser.add_argument("--latency", type=float, default=0.02, help="Base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.03, help="Extra uniform random delay, up to this")
+    parser.add_argument("--rate-429", type=float, default=0.01)
+    parser.add_argument("--rate-timeout", type=float, default=0.0,
+                        help="Share of requests that hang for --hang seconds and then drop")
+    parser.add_argument("--rate-truncate", type=float, default=0.01,
+                        help="Share of responses cut off halfway through the body")
+    parser.add_argument("--hang", type=float, default=10.0)
+    parser.add_argument("--client-timeout", type=float,
+                        help="Timeout for requests made without one (the scrapers set none)")
+    parser.add_argument("--keep-delays", action="store_true",
+                        help="Keep each scraper's DETAIL_DELAY politeness sleep")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="scripts/data/loadtest.json")
+    args = parser.parse_args(argv)
+
+    try:
+        slugs = registry.select(args.only, args.exclude)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(2)
+
+    building_hosts = []
+    for slug in slugs:
+        scraper_class = registry.load_scraper_class(slug)
+        if issubclass(scraper_class, SingleBuildingScraper):
+            building_hosts.append(urlparse(scraper_class().target_url).netloc)
+        elif not args.keep_delays:
+            # Against a local server the politeness sleep would be most of the wall time
+            scraper_class.DETAIL_DELAY = 0
+    sources = [s for s in slugs if s in BASE_LISTINGS]
+    print(f"Sources: {', '.join(sources)} + {len(building_hosts)} single-building sites")
+
+    faults = FaultConfig(args.latency, args.jitter, args.rate_429, args.rate_timeout,
+                         args.rate_truncate, args.hang, args.seed)
+    process, port = start_in_process(faults, building_hosts)
+    output = os.path.abspath(args.output)
+    results = []
+    try:
+        for scale in args.scales:
+            print(f"Running at {scale:g}x...", flush=True)
+            result = run_scale(scale, port, slugs, len(building_hosts), args.client_timeout)
+            results.append(result)
+            print(f"  {result['requests']} requests in {result['wall_seconds']}s, "
+                  f"{result['listings']} listings; log: {result['log']}", flush=True)
+    finally:
+        process.terminate()
+
+    print_report(results)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'faults': faults.as_dict(), 'client_timeout': args.client_timeout, 'runs': results}, f, indent=2)
+    print(f"\nWrote {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+# Add the current directory to path so we can import scrapers
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers import registry
+from scrapers.base import BaseScraper
+from pipeline.manifest import RunManifest
+from pipeline.scheduler import DEFAULT_DB, HOUR, RefreshScheduler
+from run_scrapers import save_results
+
+def refreshes_urls(slug: str) -> bool:
+    """Whether the scraper can fetch one detail page at a time, so its URLs refresh on their own."""
+    return registry.load_scraper_class(slug).scrape_details is not BaseScraper.scrape_details
+
+def run_due(scheduler: RefreshScheduler, only: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+            max_urls: int = 50, **save_options) -> int:
+    """Scrape due sources in full and due detail pages of the rest; returns how many fetches ran."""
+    now = time.time()
+    slugs = registry.select(only, exclude)
+    due = set(scheduler.due_sources(slugs, now))
+    manifest = RunManifest(full_run=False)
+    fetches = 0
+
+    for slug in slugs:
+        name = registry.display_name(slug)
+        try:
+            scraper = registry.load_scraper(slug)
+            if slug in due:
+                print(f"\nRunning {name} Scraper...")
+                listings = [vars(l) for l in scraper.scrape()]
+                fetches += 1
+                if not listings:
+                    # The scrapers log and swallow fetch errors, so empty means failed
+                    delay = scheduler.record_failure(slug, now)
+                    print(f"  No listings; keeping the stored copy, retrying in {delay / 60:.0f} min")
+                    manifest.fail(slug)
+                    continue
+                # Pages that failed to fetch weren't seen missing; keep their stored copies
+                failed = getattr(scraper, 'failed_urls', [])
+                changed = scheduler.record_source(slug, listings, now, failed)
+                print(f"  Found {len(listings)} listings ({'changed' if changed else 'unchanged'})")
+                manifest.add(slug, [l['url'] for l in listings] + failed)
+                continue
+            if not refreshes_urls(slug):
+                continue
+            urls = scheduler.due_urls(slug, now, max_urls)
+            if urls:
+                print(f"\nRefreshing {len(urls)} {name} listings...")
+            for url in urls:
+                time.sleep(scraper.DETAIL_DELAY)
+                try:
+                    listing = scraper.scrape_details(url)
+                except Exception as e:
+                    print(f"  Failed to refresh {url}: {e}")
+                    listing = None
+                scheduler.record_url(slug, url, vars(listing) if listing else None, now)
+                fetches += 1
+        except Exception as e:
+            print(f"  {name} failed: {e}")
+            if slug in due:
+                delay = scheduler.record_failure(slug, now)
+                print(f"  Retrying in {delay / 60:.0f} min")
+                manifest.fail(slug)
+
+    # Sources that weren't scraped in full keep their URLs attributed but are marked
+    # not ok, so the seed step doesn't count their listings as missed
+    for slug in slugs:
+        if slug not in due:
+            manifest.add(slug, scheduler.source_urls(slug), ok=False)
+
+    if fetches:
+        data = scheduler.listings()
+        print(f"\nTotal listings known: {len(data)}")
+        save_results(data, manifest, **save_options)
+    return fetches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scrape only sources (and listings) whose learned refresh interval has elapsed."
+    )
+    parser.add_argument("--only", nargs="+", metavar="SCRAPER")
+    parser.add_argument("--exclude", nargs="+", metavar="SCRAPER")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--max-urls", type=int, default=50,
+                        help="Detail pages to refresh per source per tick")
+    parser.add_argument("--daemon", action="store_true", help="Keep running, waking up when work is due")
+    parser.add_argument("--tick", type=float, default=600,
+                        help="Longest daemon sleep in seconds (default: 600)")
+    parser.add_argument("--no-history", action="store_true")
+    parser.add_argument("--osm", metavar="PATH")
+    parser.add_argument("--tiles", metavar="DIR", nargs="?", const="public/map-tiles")
+    parser.add_argument("--impute-rent", action="store_true")
+    parser.add_argument("--status", action="store_true", help="Print each source's interval and exit")
+    args = parser.parse_args(argv)
+
+    try:
+        slugs = registry.select(args.only, args.exclude)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(2)
+
+    scheduler = RefreshScheduler(args.db)
+    if args.status:
+        for row in scheduler.report():
+            due_in = (row['next_due'] - time.time()) / HOUR
+            failing = f"  {row['failures']} failures in a row" if row['failures'] else ""
+            print(f"{row['source']:22} every {row['interval_hours']:6.1f}h  "
+                  f"due in {max(due_in, 0):6.1f}h  {row['changes']}/{row['runs']} runs changed{failing}")
+        return
+
+    url_slugs = [slug for slug in slugs if refreshes_urls(slug)]
+    options = dict(record_history=not args.no_history, osm_path=args.osm, tiles_dir=args.tiles,
+                   impute_rent=args.impute_rent)
+    while True:
+        if not run_due(scheduler, args.only, args.exclude, args.max_urls, **options):
+            print("Nothing due")
+        if not args.daemon:
+            break
+        next_due = scheduler.next_due(slugs, url_slugs)
+        wait = args.tick if next_due is None else min(args.tick, max(next_due - time.time(), 1))
+        time.sleep(wait)
+    scheduler.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,140 @@
+import argparse
+import contextlib
 import json
 import os
 import sys
-from typing import List
+from typing import List, Optional
 
 # Add the current directory to path so we can import scrapers
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scrapers.base import Listing
-from scrapers.ithaca_renting import IthacaRentingScraper
-from scrapers.travis_hyde import TravisHydeScraper
-from scrapers.city_centre import CityCentreScraper
-from scrapers.simple_sites import LuxAndLoftsScraper, TheIthacanScraper, IvyAndBearScraper, CollegetownCrossingScraper
-from scrapers.urban_ithaca import UrbanIthacaScraper
-from scrapers.demos_johnny import DemosJohnnyScraper
-from scrapers.lambrou import LambrouScraper
-from scrapers.collegetown_terrace import CollegetownTerraceScraper
-from scrapers.cornell_offcampus import CornellOffCampusScraper
-
-def run_all_scrapers():
+from scrapers import registry
+from pipeline.history import HistoryStore
+from pipeline.commute import WalkingNetwork
+from pipeline.amenities import AmenityMatcher
+from pipeline.map_tiles import write_tiles
+from pipeline.manifest import RunManifest
+from pipeline.profiling import ScraperProfiler, hottest
+
+DEFAULT_OUTPUT = 'scripts/data/scraped_listings.json'
+
+def run_all_scrapers(only: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                     record_history: bool = True, osm_path: Optional[str] = None,
+                     tiles_dir: Optional[str] = None, profile_dir: Optional[str] = None,
+                     impute_rent: bool = False):
     all_listings: List[Listing] = []
-    
-    scrapers = [
-        ("Cornell Off-Campus", CornellOffCampusScraper()),
-        ("Ithaca Renting", IthacaRentingScraper()),
-        ("Travis Hyde", TravisHydeScraper()),
-        ("City Centre", CityCentreScraper()),
-        ("Lux and Lofts", LuxAndLoftsScraper()),
-        ("The Ithacan", TheIthacanScraper()),
-        ("Ivy and Bear", IvyAndBearScraper()),
-        ("Collegetown Crossing", CollegetownCrossingScraper()),
-        ("Urban Ithaca", UrbanIthacaScraper()),
-        ("Demos Johnny", DemosJohnnyScraper()),
-        ("Lambrou Real Estate", LambrouScraper()),
-        ("Collegetown Terrace", CollegetownTerraceScraper())
-    ]
-
-    for name, scraper in scrapers:
+    manifest = RunManifest(full_run=not (only or exclude))
+    profiler = ScraperProfiler(profile_dir) if profile_dir else None
+
+    for slug in registry.select(only, exclude):
+        name = registry.display_name(slug)
         print(f"\nRunning {name} Scraper...")
         try:
-            listings = scraper.scrape()
+            scraper = registry.load_scraper(slug)
+            with profiler.profile(slug) if profiler else contextlib.nullcontext():
+                listings = scraper.scrape()
             print(f"  Found {len(listings)} listings")
             all_listings.extend(listings)
+            # Pages that failed to fetch weren't seen missing, so they must not expire
+            manifest.add(slug, [l.url for l in listings] + getattr(scraper, 'failed_urls', []))
         except Exception as e:
             print(f"  {name} failed: {e}")
-    
-    # Convert to dicts
-    
+            manifest.fail(slug)
+
+    if profiler:
+        profiler.write_summary()
+        print(f"\nProfiles written to {profile_dir}; slowest: {', '.join(hottest(profiler.results))}")
+
     # Convert to dicts
     data = [vars(l) for l in all_listings]
-    
+
     print(f"\nTotal listings scraped: {len(data)}")
     # print(json.dumps(data, indent=2))
-    
+
+    save_results(data, manifest, record_history=record_history, osm_path=osm_path, tiles_dir=tiles_dir,
+                 impute_rent=impute_rent)
+
+def save_results(data: List[dict], manifest: RunManifest, record_history: bool = True,
+                 osm_path: Optional[str] = None, tiles_dir: Optional[str] = None, impute_rent: bool = False,
+                 output: str = DEFAULT_OUTPUT, history_source: Optional[str] = None):
+    """Enrich, validate and write a run's listings, then record it in the history."""
+    # numpy-backed stages; imported here so --list and small --only runs start fast
+    from pipeline.rent_model import RentModel
+    from pipeline.validate import DEFAULT_REJECTS, Validator, write_rejects
+
+    AmenityMatcher().attach(data)
+
+    # Regex-scraped prices are often a deposit or fee; score each rent against the run's own corpus
+    model = RentModel().fit(data)
+    if model.fitted:
+        print(f"Rent check: {model.attach(data, impute=impute_rent) or 'nothing flagged'}")
+    else:
+        print(f"Rent check skipped: only {model.n_train} priced listings")
+
+    if osm_path:
+        # Optional enrichment: a bad extract must not cost us the scrape itself
+        try:
+            count = WalkingNetwork.from_osm(osm_path).attach(data)
+            print(f"Attached walking times to {count} listings")
+        except Exception as e:
+            print(f"Walking times skipped: {e}")
+
+    # Catch rows the listings table would reject or mis-store before they reach the seed step
+    data, rejects = Validator().validate(data)
+    write_rejects(rejects)
+    print(f"Quarantined {len(rejects)} listings to {DEFAULT_REJECTS}")
+
     # Save to file for now
-    os.makedirs('scripts/data', exist_ok=True)
-    with open('scripts/data/scraped_listings.json', 'w') as f:
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
         json.dump(data, f, indent=2)
+    manifest.write()
+
+    if record_history:
+        store = HistoryStore()
+        # A listing only disappeared if the source that returned it scraped ok this run
+        snapshot_id = store.record(data, source=history_source, mark_missing=True,
+                                   sources=manifest.sources)
+        store.close()
+        print(f"Recorded snapshot {snapshot_id} in rent history")
+
+    if tiles_dir:
+        print(f"Wrote {write_tiles(data, tiles_dir)} map tiles to {tiles_dir}")
+
+    return data
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Ithaca rental listings.")
+    parser.add_argument("--only", nargs="+", metavar="SCRAPER",
+                        help="Run only these scrapers (see --list)")
+    parser.add_argument("--exclude", nargs="+", metavar="SCRAPER",
+                        help="Skip these scrapers")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Don't record this run in the rent history store")
+    parser.add_argument("--osm", metavar="PATH",
+                        help="OSM extract of Ithaca; adds walking minutes to campus")
+    parser.add_argument("--tiles", metavar="DIR", nargs="?", const="public/map-tiles",
+                        help="Write clustered map tiles (default dir: public/map-tiles)")
+    parser.add_argument("--profile", metavar="DIR", nargs="?", const="scripts/data/profiles",
+                        help="Profile each scraper (CPU + memory); writes .prof files and summary.txt")
+    parser.add_argument("--impute-rent", action="store_true",
+                        help="Replace anomalous (too low/high) rents with the model estimate; placeholders stay quarantined")
+    parser.add_argument("--list", action="store_true",
+                        help="List available scrapers and exit")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    run_all_scrapers()
+    args = parse_args()
+    if args.list:
+        for slug in registry.scraper_names():
+            print(f"{slug:22} {registry.display_name(slug)}")
+        sys.exit(0)
+    try:
+        registry.select(args.only, args.exclude)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(2)
+    run_all_scrapers(only=args.only, exclude=args.exclude, record_history=not args.no_history,
+                     osm_path=args.osm, tiles_dir=args.tiles, profile_dir=args.profile,
+                     impute_rent=args.impute_rent)
@@ -0,0 +1,122 @@
+import argparse
+import multiprocessing
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add the current directory to path so we can import scrapers
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers import registry
+from pipeline.manifest import RunManifest
+from pipeline.work_queue import DEFAULT_DB, WorkQueue, run_worker
+from run_scrapers import DEFAULT_OUTPUT, save_results
+
+def enqueue(args):
+    slugs = registry.select(args.only, args.exclude)
+    run_id = args.run_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    queue = WorkQueue(args.db)
+    for slug in slugs:
+        queue.enqueue(run_id, slug)
+    queue.close()
+    print(f"Enqueued run {run_id} with {len(slugs)} scrapers")
+    return run_id
+
+def _worker(db, run_id, lease_seconds, max_attempts):
+    queue = WorkQueue(db, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    handled = run_worker(queue, run_id)
+    print(f"[{queue.owner}] done, handled {handled} tasks")
+    queue.close()
+
+def work(args):
+    procs = [
+        multiprocessing.Process(target=_worker, args=(args.db, args.run_id, args.lease_seconds, args.max_attempts))
+        for _ in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+def merge(args):
+    queue = WorkQueue(args.db)
+    by_scraper = queue.results_by_scraper(args.run_id)
+    status = queue.status(args.run_id)
+    dead = queue.dead_letters(args.run_id)
+    queue.close()
+
+    # A scraper with dead tasks has an incomplete URL set; don't let it expire listings
+    failed = {task['scraper'] for task in dead}
+    manifest = RunManifest(full_run=not args.partial)
+    data = []
+    for slug, listings in by_scraper.items():
+        manifest.add(slug, [l['url'] for l in listings], ok=slug not in failed)
+        data.extend(listings)
+
+    print(f"Run {args.run_id}: {status}")
+    for task in dead:
+        print(f"  dead: {task['scraper']} {task['url'] or '(source)'}: {task['last_error']}")
+    print(f"Total listings scraped: {len(data)}")
+    save_results(data, manifest, record_history=not args.no_history, osm_path=args.osm, tiles_dir=args.tiles,
+                 impute_rent=args.impute_rent, output=args.output, history_source=f"run {args.run_id}")
+
+def add_output_options(p):
+    # Same post-processing options as run_scrapers.py, applied at merge time
+    p.add_argument('--output', default=DEFAULT_OUTPUT)
+    p.add_argument('--no-history', action='store_true')
+    p.add_argument('--osm', metavar='PATH', help='OSM extract of Ithaca; adds walking minutes to campus')
+    p.add_argument('--tiles', metavar='DIR', nargs='?', const='public/map-tiles',
+                   help='Write clustered map tiles (default dir: public/map-tiles)')
+    p.add_argument('--impute-rent', action='store_true',
+                   help='Replace anomalous (too low/high) rents with the model estimate')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run scrapers as sharded tasks on a durable local queue.")
+    parser.add_argument('--db', default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('enqueue', help='Create a run with one source task per scraper')
+    p.add_argument('--run-id')
+    p.add_argument('--only', nargs='+', metavar='SCRAPER')
+    p.add_argument('--exclude', nargs='+', metavar='SCRAPER')
+
+    p = sub.add_parser('work', help='Process tasks of a run until it is drained')
+    p.add_argument('run_id')
+    p.add_argument('--processes', type=int, default=4)
+    p.add_argument('--lease-seconds', type=float, default=120)
+    p.add_argument('--max-attempts', type=int, default=3)
+
+    p = sub.add_parser('merge', help='Write the results of a run to one output file')
+    p.add_argument('run_id')
+    p.add_argument('--partial', action='store_true',
+                   help="Run didn't cover every scraper; don't mark missing listings in history")
+    add_output_options(p)
+
+    p = sub.add_parser('run', help='enqueue + work + merge in one go')
+    p.add_argument('--run-id')
+    p.add_argument('--only', nargs='+', metavar='SCRAPER')
+    p.add_argument('--exclude', nargs='+', metavar='SCRAPER')
+    p.add_argument('--processes', type=int, default=4)
+    p.add_argument('--lease-seconds', type=float, default=120)
+    p.add_argument('--max-attempts', type=int, default=3)
+    add_output_options(p)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'enqueue':
+            enqueue(args)
+        elif args.command == 'work':
+            work(args)
+        elif args.command == 'merge':
+            merge(args)
+        elif args.command == 'run':
+            args.run_id = enqueue(args)
+            args.partial = bool(args.only or args.exclude)
+            work(args)
+            merge(args)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import re
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timezone
 
 @dataclass
@@ -21,11 +22,22 @@ class Listing:
     nearest_tcat_route: Optional[str] = None
     elevation_warning: bool = False
     distance_from_campus_miles: Optional[float] = None
+    walking_minutes_to_campus: Optional[float] = None
+    rent_estimate: Optional[float] = None
+    rent_flag: Optional[str] = None
     is_official_listing: bool = True
     photos: List[str] = field(default_factory=list)
+    amenities: Dict[str, object] = field(default_factory=dict)
     created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
+class FetchError(Exception):
+    """A detail page couldn't be fetched (network error, 429, 5xx); worth retrying."""
+
 class BaseScraper(ABC):
+    # Seconds to wait between detail page requests
+    DETAIL_DELAY = 0.5
+    DETAIL_TIMEOUT = 30
+
     def __init__(self):
         pass
 
@@ -34,6 +46,54 @@ class BaseScraper(ABC):
         """Scrape listings from the source."""
         pass
 
+    def discover_urls(self) -> Optional[List[str]]:
+        """Detail page URLs to scrape, or None if the source can't be split per URL."""
+        return None
+
+    def scrape_details(self, url: str) -> Optional[Listing]:
+        """Scrape a single detail page found by discover_urls.
+
+        None means the page isn't a listing (or is gone); a page that couldn't
+        be fetched raises FetchError so callers can retry it.
+        """
+        raise NotImplementedError
+
+    def fetch_detail(self, url: str):
+        """GET a detail page. None if it's gone (404/410); FetchError on anything else but 200."""
+        import requests
+
+        try:
+            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=self.DETAIL_TIMEOUT)
+        except requests.RequestException as e:
+            raise FetchError(f"{url}: {e}") from e
+        if response.status_code in (404, 410):
+            return None
+        if response.status_code != 200:
+            raise FetchError(f"{url}: HTTP {response.status_code}")
+        return response
+
+    def scrape_discovered(self) -> List[Listing]:
+        """Scrape every URL from discover_urls in turn.
+
+        Pages that fail to fetch are skipped and kept in failed_urls, so the run
+        manifest can keep their stored listings alive.
+        """
+        listings = []
+        self.failed_urls = []
+        for url in self.discover_urls():
+            if self.DETAIL_DELAY:
+                time.sleep(self.DETAIL_DELAY)
+            try:
+                listing = self.scrape_details(url)
+            except FetchError as e:
+                print(f"  Failed to fetch details: {e}")
+                self.failed_urls.append(url)
+                continue
+            if listing:
+                print(f"  Scraped: {listing.title}")
+                listings.append(listing)
+        return listings
+
     def normalize_address(self, address: str) -> str:
         """Clean up address string."""
         return address.split(',')[0].strip()
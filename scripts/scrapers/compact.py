@@ -0,0 +1,268 @@
+import json
+import math
+from array import array
+from dataclasses import MISSING, fields
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Union
+
+from .base import Listing
+
+LISTING_FIELDS = [f.name for f in fields(Listing)]
+
+class CompactListing:
+    """Slotted equivalent of Listing, taking the same arguments.
+
+    On its own this only saves the per-instance __dict__ (about 4% for typical
+    listings, whose strings dominate); ListingBatch is what makes many
+    snapshots cheap to hold.
+    """
+
+    __slots__ = tuple(LISTING_FIELDS)
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(LISTING_FIELDS):
+            raise TypeError(f"CompactListing takes at most {len(LISTING_FIELDS)} positional arguments")
+        values = dict(zip(LISTING_FIELDS, args))
+        for name, value in kwargs.items():
+            if name not in self.__slots__:
+                raise TypeError(f"CompactListing got an unexpected argument {name!r}")
+            if name in values:
+                raise TypeError(f"CompactListing got multiple values for {name!r}")
+            values[name] = value
+        for f in fields(Listing):
+            # None gets a fresh list/dict/timestamp, as Listing's factories would give
+            value = values.get(f.name)
+            if value is None and f.default_factory is not MISSING:
+                value = f.default_factory()
+            elif f.name not in values:
+                if f.default is MISSING:
+                    raise TypeError(f"CompactListing missing required argument {f.name!r}")
+                value = f.default
+            setattr(self, f.name, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CompactListing":
+        return cls(**{name: data[name] for name in LISTING_FIELDS if name in data})
+
+    @classmethod
+    def from_listing(cls, listing: Listing) -> "CompactListing":
+        return cls(**{name: getattr(listing, name) for name in LISTING_FIELDS})
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in LISTING_FIELDS}
+
+    def to_listing(self) -> Listing:
+        return Listing(**self.to_dict())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactListing):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"CompactListing(title={self.title!r}, url={self.url!r}, rent={self.rent})"
+
+
+class _StringPool:
+    """Maps repeated strings (or other hashables) to small integer codes. Code 0 is reserved for None."""
+
+    def __init__(self):
+        self.values: List[Optional[Hashable]] = [None]
+        self.codes: Dict[Hashable, int] = {}
+
+    def code(self, value: Optional[Hashable]) -> int:
+        if value is None:
+            return 0
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+# Required str fields with few distinct values; other str fields are free text
+LOW_CARDINALITY_TEXT = {"neighborhood", "lease_term", "heating_type"}
+# Text that is unique per listing (timestamps); interning it would only grow the pool
+UNIQUE_TEXT = {"created_at"}
+
+def _column_kinds() -> Dict[str, str]:
+    """Storage kind of every Listing field, from its annotation."""
+    kinds = {}
+    for f in fields(Listing):
+        if f.name in LOW_CARDINALITY_TEXT or f.type == Optional[str]:
+            kinds[f.name] = "interned"
+        elif f.type is str:
+            kinds[f.name] = "text"
+        elif f.type is bool:
+            kinds[f.name] = "bool"
+        elif f.type is int:
+            kinds[f.name] = "int"
+        elif f.type is float:
+            kinds[f.name] = "float"
+        elif f.type == Optional[float]:
+            kinds[f.name] = "optional_float"
+        elif f.type == List[str]:
+            kinds[f.name] = "list"
+        elif f.type == Dict[str, object]:
+            kinds[f.name] = "dict"
+        else:
+            # Fail at import rather than silently dropping the field from every batch
+            raise TypeError(f"Listing.{f.name}: no ListingBatch column for type {f.type}; add one in compact.py")
+    return kinds
+
+COLUMN_KINDS = _column_kinds()
+
+def _fields_of(kind: str) -> tuple:
+    return tuple(name for name, k in COLUMN_KINDS.items() if k == kind)
+
+# Low-cardinality columns stored as codes into a shared pool
+INTERNED_FIELDS = _fields_of("interned")
+# Free text, stored as plain lists
+TEXT_FIELDS = _fields_of("text")
+INT_FIELDS = _fields_of("int")
+FLOAT_FIELDS = _fields_of("float")
+BOOL_FIELDS = _fields_of("bool")
+# Optional floats; NaN marks None in the array
+OPTIONAL_FLOAT_FIELDS = _fields_of("optional_float")
+# Lists of strings (photo URLs), stored as tuples of shared strings
+LIST_FIELDS = _fields_of("list")
+# Small dicts (amenity flags); each distinct dict is interned as a tuple of items
+DICT_FIELDS = _fields_of("dict")
+
+DEFAULTS = {f.name: f.default for f in fields(Listing) if f.default is not MISSING}
+
+_MISSING = float("nan")
+
+class ListingBatch:
+    """Column-oriented container of listings with interned categorical strings.
+
+    Numeric columns live in typed arrays and categorical strings are stored once
+    per distinct value, so tens of thousands of listings from many snapshots
+    take a fraction of the memory of the equivalent list of dicts.
+    """
+
+    def __init__(self, listings: Iterable[Union[Dict, Listing, CompactListing]] = ()):
+        self._pools: Dict[str, _StringPool] = {name: _StringPool() for name in INTERNED_FIELDS}
+        self._codes: Dict[str, array] = {name: array("I") for name in INTERNED_FIELDS}
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_FIELDS}
+        self._ints: Dict[str, array] = {name: array("q") for name in INT_FIELDS}
+        self._floats: Dict[str, array] = {name: array("d") for name in FLOAT_FIELDS}
+        self._bools: Dict[str, array] = {name: array("b") for name in BOOL_FIELDS}
+        self._optional: Dict[str, array] = {name: array("d") for name in OPTIONAL_FLOAT_FIELDS}
+        self._lists: Dict[str, List[tuple]] = {name: [] for name in LIST_FIELDS}
+        # Amenity flag sets repeat heavily; intern each distinct set as a tuple of items
+        self._dict_pools: Dict[str, _StringPool] = {name: _StringPool() for name in DICT_FIELDS}
+        self._dicts: Dict[str, array] = {name: array("I") for name in DICT_FIELDS}
+        self._intern_text: Dict[str, str] = {}
+        self._count = 0
+        self.extend(listings)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, listing: Union[Dict, Listing, CompactListing]):
+        data = listing if isinstance(listing, dict) else {name: getattr(listing, name) for name in LISTING_FIELDS}
+        for name in INTERNED_FIELDS:
+            self._codes[name].append(self._pools[name].code(data.get(name)))
+        for name in TEXT_FIELDS:
+            if name in UNIQUE_TEXT:
+                self._text[name].append(data.get(name))
+                continue
+            # Boilerplate descriptions repeat across units and snapshots; keep one copy
+            value = data[name]
+            self._text[name].append(self._intern_text.setdefault(value, value))
+        for name in INT_FIELDS:
+            self._ints[name].append(data[name])
+        for name in FLOAT_FIELDS:
+            self._floats[name].append(data.get(name, DEFAULTS.get(name, 0.0)))
+        for name in BOOL_FIELDS:
+            self._bools[name].append(bool(data.get(name, DEFAULTS.get(name, False))))
+        for name in OPTIONAL_FLOAT_FIELDS:
+            value = data.get(name)
+            self._optional[name].append(_MISSING if value is None else value)
+        intern = self._intern_text
+        for name in LIST_FIELDS:
+            self._lists[name].append(tuple(intern.setdefault(v, v) for v in data.get(name) or ()))
+        for name in DICT_FIELDS:
+            self._dicts[name].append(self._dict_pools[name].code(tuple((data.get(name) or {}).items())))
+        self._count += 1
+
+    def extend(self, listings: Iterable[Union[Dict, Listing, CompactListing]]):
+        for listing in listings:
+            self.append(listing)
+
+    def column(self, name: str) -> Union[array, List]:
+        """Raw column access for vectorized consumers (e.g. numpy.frombuffer)."""
+        if name in INT_FIELDS:
+            return self._ints[name]
+        if name in FLOAT_FIELDS:
+            return self._floats[name]
+        if name in BOOL_FIELDS:
+            return self._bools[name]
+        if name in OPTIONAL_FLOAT_FIELDS:
+            return self._optional[name]
+        if name in TEXT_FIELDS:
+            return self._text[name]
+        if name in INTERNED_FIELDS:
+            values = self._pools[name].values
+            return [values[c] for c in self._codes[name]]
+        if name in LIST_FIELDS:
+            return [list(v) for v in self._lists[name]]
+        if name in DICT_FIELDS:
+            return [self._dict(name, i) for i in range(len(self))]
+        raise KeyError(name)
+
+    def _dict(self, name: str, i: int) -> Dict[str, object]:
+        return dict(self._dict_pools[name].values[self._dicts[name][i]] or ())
+
+    def to_dict(self, i: int) -> Dict:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        data = {}
+        for name in LISTING_FIELDS:
+            if name in INTERNED_FIELDS:
+                data[name] = self._pools[name].values[self._codes[name][i]]
+            elif name in TEXT_FIELDS:
+                data[name] = self._text[name][i]
+            elif name in INT_FIELDS:
+                data[name] = self._ints[name][i]
+            elif name in FLOAT_FIELDS:
+                data[name] = self._floats[name][i]
+            elif name in BOOL_FIELDS:
+                data[name] = bool(self._bools[name][i])
+            elif name in OPTIONAL_FLOAT_FIELDS:
+                value = self._optional[name][i]
+                data[name] = None if math.isnan(value) else value
+            elif name in LIST_FIELDS:
+                data[name] = list(self._lists[name][i])
+            else:
+                data[name] = self._dict(name, i)
+        return data
+
+    def __getitem__(self, i: int) -> CompactListing:
+        return CompactListing(**self.to_dict(i))
+
+    def __iter__(self) -> Iterator[CompactListing]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_dicts(self) -> List[Dict]:
+        return [self.to_dict(i) for i in range(len(self))]
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict]) -> "ListingBatch":
+        return cls(rows)
+
+    @classmethod
+    def load(cls, *paths: str) -> "ListingBatch":
+        """Load one or more scraped_listings.json snapshots into a single batch."""
+        batch = cls()
+        for path in paths:
+            with open(path) as f:
+                batch.extend(json.load(f))
+        return batch
@@ -2,7 +2,6 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List, Optional
 import re
-import time
 from .base import BaseScraper, Listing
 
 class CornellOffCampusScraper(BaseScraper):
@@ -10,7 +9,10 @@ class CornellOffCampusScraper(BaseScraper):
     START_URL = "https://listings.offcampusliving.cornell.edu/listings?search=&priceMin=500&priceMax=3900&bedroom=10&pets=any&likes=false&view=list&safety=false"
 
     def scrape(self) -> List[Listing]:
-        listings = []
+        return self.scrape_discovered()
+
+    def discover_urls(self) -> List[str]:
+        urls = []
         current_url = self.START_URL
         page_count = 0
         
@@ -28,83 +30,16 @@ class CornellOffCampusScraper(BaseScraper):
                 
                 soup = BeautifulSoup(response.text, 'html.parser')
                 
-                # Find listing cards
-                # Based on inspection, they seem to be in a list
-                # We'll look for elements that look like listing containers
-                
-                # Common pattern in these sites: div with class 'listing' or similar
-                # Let's try to find all divs that contain a link to /listings/view/
-                
-                listing_cards = []
-                for a in soup.find_all('a', href=True):
-                    if '/listings/view/' in a['href']:
-                        # This link is likely the "View" button or title
-                        # We need the container card. 
-                        # Usually the card is a parent or ancestor.
-                        # Let's assume the card is the closest div with some content
-                        card = a.find_parent('div', class_=lambda x: x and 'listing' in x if x else False)
-                        if not card:
-                            # Fallback: just use the parent container if it looks substantial
-                            card = a.find_parent('div', style=False) # simplistic
-                        
-                        if card and card not in listing_cards:
-                            listing_cards.append(card)
-                
-                # If we can't find cards by class, let's just iterate over the links and visit details pages?
-                # That might be too slow. Let's try to extract from the list view first.
-                
-                # Actually, let's try a more robust selector.
-                # Looking at standard rental sites, usually there's a main container.
-                # Let's find all elements with class containing 'listing-result' or similar if possible.
-                # Since I can't inspect live, I'll rely on finding the links and extracting info from the card text.
-                
-                # Better approach: Find all 'div's that contain the text "Bedrooms" or "Rent"
-                potential_cards = soup.find_all('div', class_=lambda x: x and ('listing' in x or 'property' in x) if x else False)
-                
-                # If that fails, let's just grab all links to details pages and scrape them?
-                # No, let's try to get what we can from the list page.
-                
-                # Let's iterate over all links to /listings/view/
-                seen_urls = set()
-                
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
-                    if '/listings/view/' in href:
-                        full_url = self.BASE_URL + href
-                        if full_url in seen_urls:
-                            continue
-                        seen_urls.add(full_url)
-                        
-                        # Now try to find the card context for this link
-                        # The link is usually the title or "View Listing" button
-                        card = a.find_parent('div', class_='listing') # Guessing class name
-                        if not card:
-                             card = a.find_parent('div', class_='row') # Bootstrap?
-                        
-                        if not card:
-                            # If we can't find a card, we might have to skip or just use the URL
-                            # Let's try to scrape the details page directly for better data
-                            # It's slower but more reliable if we don't know the list DOM
-                            # Given the user wants "all listings", accuracy is good.
-                            # But 150 listings * 1 request each = 150 requests. That's fine.
-                            pass
-
-                # Let's actually just scrape the list of URLs from the page and visit them.
-                # It's safer.
-                
+                # We can't rely on the list page DOM for listing cards, so collect
+                # the /listings/view/ links and scrape each details page instead.
+                # It's slower but more reliable. 150 listings * 1 request each is fine.
                 page_links = set()
                 for a in soup.find_all('a', href=True):
                     if '/listings/view/' in a['href']:
                         page_links.add(self.BASE_URL + a['href'])
                 
                 print(f"    Found {len(page_links)} listings on this page.")
-                
-                for url in page_links:
-                    listing = self.scrape_details(url)
-                    if listing:
-                        listings.append(listing)
-                        print(f"    Scraped: {listing.title}")
-                    time.sleep(0.5) # Be nice
+                urls.extend(sorted(page_links - set(urls)))
                 
                 # Find next page
                 # Look for a link with text "Next" or "Next page" or class "next"
@@ -126,14 +61,13 @@ class CornellOffCampusScraper(BaseScraper):
                 print(f"  Error on page {page_count}: {e}")
                 break
                 
-        return listings
+        return urls
 
     def scrape_details(self, url: str) -> Optional[Listing]:
+        response = self.fetch_detail(url)
+        if response is None:
+            return None
         try:
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-            if response.status_code != 200:
-                return None
-            
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Title
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import time
+from typing import Optional
+
+import requests
+
+DEFAULT_CACHE = 'scripts/data/http_cache.sqlite'
+USER_AGENT = 'Mozilla/5.0'
+
+SCHEMA = """
+create table if not exists pages (
+  url text primary key,
+  etag text,
+  last_modified text,
+  fetched_at real not null,
+  body text not null
+);
+"""
+
+class CachedPage:
+    # status is 'fresh' (served from cache, no request), 'not_modified' (304),
+    # 'modified' (new body) or 'stale' (request failed, last good body returned)
+    def __init__(self, url: str, body: str, status: str):
+        self.url = url
+        self.body = body
+        self.status = status
+
+    @property
+    def changed(self) -> bool:
+        return self.status == 'modified'
+
+class ConditionalFetcher:
+    """GETs that are skipped while a page is fresh and revalidated with ETag/Last-Modified after.
+
+    Within max_age seconds of the last successful fetch the cached body is
+    returned without touching the network. After that the request carries
+    If-None-Match / If-Modified-Since, so an unchanged page costs a 304 with
+    no body. If the site errors or is unreachable, the last good copy is used.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE, max_age: float = 6 * 3600, timeout: float = 20):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('pragma journal_mode=wal')
+        self.conn.executescript(SCHEMA)
+        self.max_age = max_age
+        self.timeout = timeout
+        self.requests = 0
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[CachedPage]:
+        max_age = self.max_age if max_age is None else max_age
+        row = self.conn.execute(
+            'select etag, last_modified, fetched_at, body from pages where url = ?', (url,)
+        ).fetchone()
+        now = time.time()
+        if row and now - row[2] < max_age:
+            return CachedPage(url, row[3], 'fresh')
+
+        headers = {'User-Agent': USER_AGENT}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        try:
+            self.requests += 1
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"  Failed to fetch {url}: {e}")
+            return CachedPage(url, row[3], 'stale') if row else None
+
+        with self.conn:
+            if response.status_code == 304 and row:
+                self.conn.execute('update pages set fetched_at = ? where url = ?', (now, url))
+                return CachedPage(url, row[3], 'not_modified')
+            if response.status_code != 200:
+                print(f"  Failed to fetch {url}: {response.status_code}")
+                return CachedPage(url, row[3], 'stale') if row else None
+            self.conn.execute(
+                'insert or replace into pages (url, etag, last_modified, fetched_at, body) values (?, ?, ?, ?, ?)',
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), now, response.text)
+            )
+        return CachedPage(url, response.text, 'modified')
@@ -2,14 +2,18 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List, Optional
 import re
-import time
 from .base import BaseScraper, Listing
 
 class IthacaRentingScraper(BaseScraper):
     BASE_URL = "https://ithacarenting.com"
     
+    DETAIL_DELAY = 1 # Be nice to the server
+
     def scrape(self) -> List[Listing]:
-        listings = []
+        return self.scrape_discovered()
+
+    def discover_urls(self) -> List[str]:
+        urls = []
         # Scrape both Collegetown and Downtown
         for path in ["/collegetown/", "/downtown/"]:
             url = self.BASE_URL + path
@@ -19,53 +23,30 @@ class IthacaRentingScraper(BaseScraper):
                 response.raise_for_status()
                 soup = BeautifulSoup(response.text, 'html.parser')
                 
-                # Find all listing blocks
-                # Based on inspection: class="rmwb_header-section" contains the header and link
-                # But we probably want the container that wraps this and maybe more info?
-                # Actually, the link is enough to get details.
-                
-                # The inspection showed:
-                # <div class="rmwb_header-section ...">
-                #   <div class="detail-button">
-                #     <p class="detail-arrow" href="...">
-                
-                # Let's find all elements with href containing 'unit-details'
-                # Note: The href was on a <p> tag in the inspection output? 
-                # Let's double check if it's an <a> tag or if the inspection output was misleading.
-                # Usually href is on <a>. If it's on <p>, it might be JS handled.
-                # But let's look for any tag with href containing unit-details
-                
+                # Detail links look like unit-details/?uid=204. The href is not
+                # always on an <a> (the inspection showed it on a <p>), so match any tag.
                 links = soup.find_all(attrs={"href": re.compile(r"unit-details/\?uid=")})
                 
-                seen_urls = set()
-                
                 for link in links:
                     detail_url = link['href']
                     if not detail_url.startswith('http'):
                         detail_url = self.BASE_URL + detail_url
                     
-                    if detail_url in seen_urls:
+                    if detail_url in urls:
                         continue
-                    seen_urls.add(detail_url)
-                    
+                    urls.append(detail_url)
                     print(f"  Found listing: {detail_url}")
-                    time.sleep(1) # Be nice to the server
-                    listing = self.scrape_details(detail_url)
-                    if listing:
-                        listings.append(listing)
                         
             except Exception as e:
                 print(f"Error scraping {url}: {e}")
                 
-        return listings
+        return urls
 
     def scrape_details(self, url: str) -> Optional[Listing]:
+        response = self.fetch_detail(url)
+        if response is None:
+            return None
         try:
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-            if response.status_code != 200:
-                print(f"  Failed to fetch details: {response.status_code}")
-                return None
-                
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Title
@@ -2,20 +2,18 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List, Optional
 import re
-import time
 from .base import BaseScraper, Listing
 
 class LambrouScraper(BaseScraper):
     BASE_URL = "https://www.lambrourealestate.com"
     
     def scrape(self) -> List[Listing]:
-        listings = []
+        return self.scrape_discovered()
+
+    def discover_urls(self) -> List[str]:
+        urls = []
         # Lambrou lists properties directly on the page or subpages
         # The chunk showed links like "103 Eddy Street (5 Bed)"
-        
-        url = self.BASE_URL + "/neighborhood" # Or just check the homepage/sitemap
-        # Actually the chunk showed links on /neighborhood page? No, it showed links in the chunk.
-        # Let's try scraping the homepage or a known list page.
         # The chunk showed [All](https://www.lambrourealestate.com/houses)
         
         for path in ["/houses", "/apartments"]:
@@ -37,23 +35,17 @@ class LambrouScraper(BaseScraper):
                         links.add(href)
                 
                 print(f"  Found {len(links)} listings on {path}")
-                
-                for link in links:
-                    time.sleep(0.5)
-                    listing = self.scrape_details(link)
-                    if listing:
-                        listings.append(listing)
+                urls.extend(sorted(links - set(urls)))
                         
             except Exception as e:
                 print(f"Error scraping {url}: {e}")
-        return listings
+        return urls
 
     def scrape_details(self, url: str) -> Optional[Listing]:
+        response = self.fetch_detail(url)
+        if response is None:
+            return None
         try:
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-            if response.status_code != 200:
-                return None
-            
             soup = BeautifulSoup(response.text, 'html.parser')
             
             title_elem = soup.find('h1') or soup.find('h2')
@@ -0,0 +1,55 @@
+import importlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .base import BaseScraper
+
+# slug -> (display name, module, class name)
+# Modules are only imported when a scraper is actually selected, so a run of a
+# single lightweight source never pays for requests/bs4 or the other scrapers.
+SCRAPERS: Dict[str, Tuple[str, str, str]] = {
+    "cornell-offcampus": ("Cornell Off-Campus", "cornell_offcampus", "CornellOffCampusScraper"),
+    "ithaca-renting": ("Ithaca Renting", "ithaca_renting", "IthacaRentingScraper"),
+    "travis-hyde": ("Travis Hyde", "travis_hyde", "TravisHydeScraper"),
+    "city-centre": ("City Centre", "city_centre", "CityCentreScraper"),
+    "lux-and-lofts": ("Lux and Lofts", "simple_sites", "LuxAndLoftsScraper"),
+    "the-ithacan": ("The Ithacan", "simple_sites", "TheIthacanScraper"),
+    "ivy-and-bear": ("Ivy and Bear", "simple_sites", "IvyAndBearScraper"),
+    "collegetown-crossing": ("Collegetown Crossing", "simple_sites", "CollegetownCrossingScraper"),
+    "urban-ithaca": ("Urban Ithaca", "urban_ithaca", "UrbanIthacaScraper"),
+    "demos-johnny": ("Demos Johnny", "demos_johnny", "DemosJohnnyScraper"),
+    "lambrou": ("Lambrou Real Estate", "lambrou", "LambrouScraper"),
+    "collegetown-terrace": ("Collegetown Terrace", "collegetown_terrace", "CollegetownTerraceScraper"),
+}
+
+
+def scraper_names() -> List[str]:
+    """All registered scraper slugs, in run order."""
+    return list(SCRAPERS)
+
+
+def display_name(slug: str) -> str:
+    return SCRAPERS[slug][0]
+
+
+def load_scraper_class(slug: str) -> type:
+    """Import the scraper's module on demand and return its class."""
+    if slug not in SCRAPERS:
+        raise KeyError(f"Unknown scraper '{slug}'. Choose from: {', '.join(SCRAPERS)}")
+    _, module_name, class_name = SCRAPERS[slug]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, class_name)
+
+
+def load_scraper(slug: str) -> BaseScraper:
+    return load_scraper_class(slug)()
+
+
+def select(only: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) -> List[str]:
+    """Resolve --only/--exclude selections into an ordered list of slugs."""
+    only = list(only or [])
+    exclude = set(exclude or [])
+    for slug in list(only) + list(exclude):
+        if slug not in SCRAPERS:
+            raise KeyError(f"Unknown scraper '{slug}'. Choose from: {', '.join(SCRAPERS)}")
+    selected = [s for s in SCRAPERS if s in only] if only else scraper_names()
+    return [s for s in selected if s not in exclude]
@@ -1,18 +1,159 @@
-from typing import List
+import os
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
 from .base import BaseScraper, Listing
+from .http_cache import ConditionalFetcher
+
+BED_RE = re.compile(r"\b(studio)\b|\b(\d)\s*(?:-\s*)?(?:bed(?:room)?s?|br|bd)\b", re.I)
+BATH_RE = re.compile(r"\b(\d(?:\.5)?)\s*(?:-\s*)?(?:bath(?:room)?s?|ba)\b", re.I)
+PRICE_RE = re.compile(r"\$\s?(\d{1,2},\d{3}|\d{3,5})")
+PER_PERSON_RE = re.compile(r"per\s+(?:person|bed(?:room)?|student|tenant)|/\s*(?:person|bed|student)\b|\bpp\b", re.I)
+# A dollar amount right after one of these is not the rent
+NOT_RENT_RE = re.compile(r"(deposit|fee|application|parking|utilit|amenity|admin)[^$]{0,25}$", re.I)
+FLOORPLAN_LINK_RE = re.compile(r"floor[\s-]*plans?|availab|pricing|rates", re.I)
+# Blocks with more text than this are page sections holding many plans, not one plan
+MAX_BLOCK_CHARS = 600
+MAX_UNITS = 40
+MIN_RENT, MAX_RENT = 300, 15000
+
+def parse_floor_plans(html: str) -> List[Dict]:
+    """Unit types on a floor-plan/availability page: name, bedrooms, bathrooms, rent, per_person.
+
+    Looks for the innermost elements whose text mentions both a bedroom count
+    and a price, which is how floor-plan cards and pricing tables are laid out
+    on every building site we scrape. Rent is the lowest plausible price in
+    the block ("starting at"); deposits and fees are skipped.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(['script', 'style', 'nav', 'header', 'footer']):
+        tag.decompose()
+
+    blocks = []
+    for tag in soup.find_all(['div', 'li', 'article', 'section', 'tr']):
+        text = tag.get_text(' ', strip=True)
+        if len(text) <= MAX_BLOCK_CHARS and BED_RE.search(text) and PRICE_RE.search(text):
+            blocks.append((tag, text))
+    ids = {id(tag) for tag, _ in blocks}
+    outer = {id(parent) for tag, _ in blocks for parent in tag.parents if id(parent) in ids}
+
+    units: Dict[tuple, Dict] = {}
+    for tag, text in blocks:
+        if id(tag) in outer:
+            continue
+        prices = [int(m.group(1).replace(',', '')) for m in PRICE_RE.finditer(text)
+                  if not NOT_RENT_RE.search(text[:m.start()])]
+        prices = [p for p in prices if MIN_RENT <= p <= MAX_RENT]
+        if not prices:
+            continue
+        bed = BED_RE.search(text)
+        bedrooms = 0 if bed.group(1) else int(bed.group(2))
+        bath = BATH_RE.search(text)
+        heading = tag.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong'])
+        name = heading.get_text(' ', strip=True) if heading else ''
+        if not name or len(name) > 60 or PRICE_RE.search(name):
+            name = 'Studio' if bedrooms == 0 else f"{bedrooms} Bedroom"
+        unit = {
+            'name': name,
+            'bedrooms': bedrooms,
+            'bathrooms': float(bath.group(1)) if bath else 1.0,
+            'rent': min(prices),
+            'per_person': bool(PER_PERSON_RE.search(text)),
+        }
+        # Same plan listed twice (e.g. per floor): keep the lowest price, as the url is per plan
+        key = (unit['name'], unit['bedrooms'], unit['bathrooms'])
+        if key not in units or unit['rent'] < units[key]['rent']:
+            units[key] = unit
+    return list(units.values())[:MAX_UNITS]
+
+def find_floor_plan_link(html: str, base_url: str) -> Optional[str]:
+    """First same-site link labelled floor plans / availability / pricing."""
+    soup = BeautifulSoup(html, 'html.parser')
+    host = urlparse(base_url).netloc
+    for a in soup.find_all('a', href=True):
+        href = urljoin(base_url, a['href']).split('#')[0]
+        if urlparse(href).netloc != host or href.rstrip('/') == base_url.rstrip('/'):
+            continue
+        if FLOORPLAN_LINK_RE.search(a.get_text(' ', strip=True)) or FLOORPLAN_LINK_RE.search(a['href']):
+            return href
+    return None
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip('-')
 
 class SingleBuildingScraper(BaseScraper):
-    def __init__(self, title: str, url: str, address: str, description: str = "", photos: List[str] = None):
+    # Seconds a fetched page is reused without any request; after that it is
+    # revalidated with a conditional GET, which costs a 304 if nothing changed
+    CACHE_SECONDS = int(os.environ.get('BUILDING_CACHE_SECONDS', 6 * 3600))
+
+    def __init__(self, title: str, url: str, address: str, description: str = "", photos: List[str] = None,
+                 floorplans_url: Optional[str] = None):
         super().__init__()
         self.title = title
         self.target_url = url
         self.address = address
         self.description = description
         self.photos = photos or []
+        # Found from the homepage's links when not given
+        self.floorplans_url = floorplans_url
 
     def scrape(self) -> List[Listing]:
+        fetcher = ConditionalFetcher(max_age=self.CACHE_SECONDS)
+        try:
+            units, page_url = self.scrape_units(fetcher)
+        finally:
+            fetcher.close()
+        if units:
+            return [self.unit_listing(unit, page_url) for unit in units]
         # Return a single listing representing the building
-        return [Listing(
+        return [self.building_listing()]
+
+    def scrape_units(self, fetcher: ConditionalFetcher):
+        """(unit types, page they came from); no units if no page lists any."""
+        url = self.floorplans_url
+        if not url:
+            home = fetcher.get(self.target_url)
+            if home is None:
+                return [], None
+            url = find_floor_plan_link(home.body, self.target_url)
+            if not url:
+                return parse_floor_plans(home.body), self.target_url
+        page = fetcher.get(url)
+        if page is None:
+            return [], None
+        return parse_floor_plans(page.body), url
+
+    def unit_listing(self, unit: Dict, page_url: str) -> Listing:
+        neighborhood = self.infer_neighborhood(self.address)
+        rent = unit['rent']
+        description = self.description
+        if unit['per_person']:
+            # Listings are priced per unit; keep the advertised per-person price in the text
+            rent *= max(unit['bedrooms'], 1)
+            description = f"{description} ${unit['rent']:,} per person.".strip()
+        return Listing(
+            title=f"{self.title} - {unit['name']}",
+            address=self.address,
+            rent=rent,
+            bedrooms=unit['bedrooms'],
+            bathrooms=unit['bathrooms'],
+            neighborhood=neighborhood,
+            lease_term="12-month",
+            heating_type=self.parse_heating_source(self.description),
+            description=description,
+            # listings.url is unique, so each unit type gets its own fragment
+            url=f"{page_url}#{_slug(unit['name'])}-{unit['bedrooms']}br-{_slug(str(unit['bathrooms']))}ba",
+            nearest_tcat_route=self.infer_tcat_route(self.address),
+            elevation_warning=self.infer_elevation_warning(neighborhood),
+            photos=self.photos,
+            is_official_listing=True
+        )
+
+    def building_listing(self) -> Listing:
+        return Listing(
             title=self.title,
             address=self.address,
             rent=0, # Unknown/Variable
@@ -27,4 +168,4 @@ class SingleBuildingScraper(BaseScraper):
             elevation_warning=self.infer_elevation_warning(self.infer_neighborhood(self.address)),
             photos=self.photos,
             is_official_listing=True
-        )]
+        )
@@ -8,9 +8,14 @@ class TravisHydeScraper(BaseScraper):
     BASE_URL = "https://travishyde.com"
     LISTING_URL = "https://travishyde.com/residential-properties-ithaca-ny"
     
+    DETAIL_DELAY = 0
+
     def scrape(self) -> List[Listing]:
-        listings = []
+        return self.scrape_discovered()
+
+    def discover_urls(self) -> List[str]:
         print(f"Scraping {self.LISTING_URL}...")
+        links = set()
         try:
             response = requests.get(self.LISTING_URL, headers={'User-Agent': 'Mozilla/5.0'})
             response.raise_for_status()
@@ -18,13 +23,7 @@ class TravisHydeScraper(BaseScraper):
             
             # Find property links
             # Based on markdown, they have "View More" links
-            # Let's look for links to specific property pages
-            
-            # We can look for links that start with the base url and are not the listing url
-            # Or look for specific classes.
-            # Let's try to find all 'a' tags with 'View More' text or similar, or just inspect hrefs
-            
-            links = set()
+            # We look for links that start with the base url and are not the listing url
             for a in soup.find_all('a', href=True):
                 href = a['href']
                 if not href.startswith('http'):
@@ -41,30 +40,24 @@ class TravisHydeScraper(BaseScraper):
                 if path in ['/', '/home', '/residential-properties-ithaca-ny']:
                     continue
                 
-                # Check if it looks like a property page
-                # Maybe check if it's listed in the main content area
                 links.add(href)
             
             print(f"  Found {len(links)} potential property links")
-            
-            for url in links:
-                # print(f"  Checking {url}...")
-                listing = self.scrape_property(url)
-                if listing:
-                    print(f"  Found listing: {listing.title}")
-                    listings.append(listing)
                     
         except Exception as e:
             print(f"Error scraping Travis Hyde: {e}")
             
-        return listings
+        return sorted(links)
+
+    def scrape_details(self, url: str) -> Optional[Listing]:
+        # Not every discovered link is a property; scrape_property returns None for those
+        return self.scrape_property(url)
 
     def scrape_property(self, url: str) -> Optional[Listing]:
+        response = self.fetch_detail(url)
+        if response is None:
+            return None
         try:
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-            if response.status_code != 200:
-                return None
-            
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Check if it's actually a property page
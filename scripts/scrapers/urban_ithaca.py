@@ -2,14 +2,16 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List, Optional
 import re
-import time
 from .base import BaseScraper, Listing
 
 class UrbanIthacaScraper(BaseScraper):
     BASE_URL = "https://www.urbanithaca.com"
     
     def scrape(self) -> List[Listing]:
-        listings = []
+        return self.scrape_discovered()
+
+    def discover_urls(self) -> List[str]:
+        urls = []
         for path in ["/apartments", "/houses"]:
             url = self.BASE_URL + path
             print(f"Scraping {url}...")
@@ -29,23 +31,17 @@ class UrbanIthacaScraper(BaseScraper):
                         links.add(href)
                 
                 print(f"  Found {len(links)} listings on {path}")
-                
-                for link in links:
-                    time.sleep(0.5)
-                    listing = self.scrape_details(link)
-                    if listing:
-                        listings.append(listing)
+                urls.extend(sorted(links - set(urls)))
                         
             except Exception as e:
                 print(f"Error scraping {url}: {e}")
-        return listings
+        return urls
 
     def scrape_details(self, url: str) -> Optional[Listing]:
+        response = self.fetch_detail(url)
+        if response is None:
+            return None
         try:
-            response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-            if response.status_code != 200:
-                return None
-            
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Title
@@ -47,6 +47,16 @@ async function seed() {
     const listings = JSON.parse(fs.readFileSync(dataPath, 'utf-8'));
     console.log(`Found ${listings.length} listings to insert.`);
 
+    // Which URLs each scraper saw this run (written by run_scrapers.py / run_workers.py)
+    const manifestPath = path.resolve(process.cwd(), 'scripts/data/scrape_manifest.json');
+    const manifest = fs.existsSync(manifestPath) ? JSON.parse(fs.readFileSync(manifestPath, 'utf-8')) : null;
+    const sourceByUrl: Record<string, string> = {};
+    if (manifest) {
+        for (const [source, entry] of Object.entries<any>(manifest.sources)) {
+            for (const url of entry.urls) sourceByUrl[url] = source;
+        }
+    }
+
     let insertedCount = 0;
     let errorCount = 0;
 
@@ -74,8 +84,13 @@ async function seed() {
                 distance_from_campus_miles: listing.distance_from_campus_miles || 0.5,
                 is_official_listing: true,
                 photos: listing.photos,
+                rent_estimate: listing.rent_estimate ?? null,
+                rent_flag: listing.rent_flag ?? null,
                 last_scraped_at: runTimestamp,
-                updated_at: runTimestamp
+                updated_at: runTimestamp,
+                source: sourceByUrl[listing.url] ?? null,
+                missed_scrapes: 0,
+                expired_at: null
             }, { onConflict: 'url' });
 
         if (error) {
@@ -89,21 +104,40 @@ async function seed() {
 
     console.log(`Upsert complete. Inserted/Updated: ${insertedCount}, Errors: ${errorCount}`);
 
-    // Prune stale listings
-    // Delete official listings that were NOT updated in this run
-    // We use a small buffer (e.g., 1 minute) to be safe, or just check inequality
-    console.log("Pruning stale listings...");
-
-    const { error: deleteError, count } = await supabase
-        .from('listings')
-        .delete({ count: 'exact' })
-        .eq('is_official_listing', true)
-        .lt('last_scraped_at', runTimestamp);
-
-    if (deleteError) {
-        console.error("Error pruning stale listings:", deleteError.message);
-    } else {
-        console.log(`Pruned ${count} stale listings.`);
+    // Expire stale listings per source
+    // A listing is soft-deleted (expired_at) only after its source scraped successfully
+    // EXPIRY_GRACE_RUNS times in a row without it, so one failed scrape can't wipe a source.
+    if (!manifest) {
+        console.log("No scrape manifest found; skipping expiry.");
+        return;
+    }
+    const grace = parseInt(process.env.EXPIRY_GRACE_RUNS || '3');
+    console.log(`Expiring stale listings (grace: ${grace} runs)...`);
+
+    const sources: [string | null, any][] = Object.entries<any>(manifest.sources);
+    // Rows stored before sources were tracked can only be judged by a full, clean run
+    if (manifest.full_run && sources.every(([, entry]) => entry.ok && entry.urls.length > 0)) {
+        sources.push([null, { ok: true, urls: Object.keys(sourceByUrl) }]);
+    }
+
+    for (const [source, entry] of sources) {
+        const label = source ?? '(untracked)';
+        if (!entry.ok || entry.urls.length === 0) {
+            console.log(`  ${label}: scrape failed or empty, skipping`);
+            continue;
+        }
+        const { data, error } = await supabase.rpc('reconcile_source_listings', {
+            p_source: source,
+            p_seen_urls: entry.urls,
+            p_run_at: runTimestamp,
+            p_grace: grace
+        });
+        if (error) {
+            console.error(`  ${label}: error reconciling:`, error.message);
+        } else {
+            const { missed, expired } = data?.[0] ?? { missed: 0, expired: 0 };
+            console.log(`  ${label}: ${missed} missed, ${expired} expired`);
+        }
     }
 
 }
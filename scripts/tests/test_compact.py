@@ -0,0 +1,38 @@
+from dataclasses import fields
+
+from scrapers.base import Listing
+from scrapers.compact import COLUMN_KINDS, CompactListing, ListingBatch
+
+def listing(**overrides):
+    data = dict(title='12 Eddy St', address='12 Eddy St, Ithaca, NY', rent=1450, bedrooms=2, bathrooms=1.5,
+                neighborhood='Collegetown', lease_term='12-month', heating_type='Gas', description='Sunny',
+                url='https://example.com/12-eddy')
+    data.update(overrides)
+    return Listing(**data)
+
+def test_every_listing_field_has_a_column():
+    assert set(COLUMN_KINDS) == {f.name for f in fields(Listing)}
+
+def test_compact_listing_round_trips():
+    original = listing(walking_minutes_to_campus=9.5, photos=['https://example.com/a.jpg'])
+    compact = CompactListing.from_listing(original)
+    assert compact.to_listing() == original
+    assert CompactListing(*vars(original).values()) == compact
+
+def test_compact_listing_defaults_match_listing():
+    original = listing()
+    compact = CompactListing(**{k: v for k, v in vars(original).items() if k != 'created_at'})
+    assert compact.photos == [] and compact.amenities == {} and compact.rent_flag is None
+    assert compact.created_at
+
+def test_batch_round_trips_every_field():
+    rows = [
+        vars(listing(rent_estimate=1500.0, rent_flag='too_low', amenities={'dishwasher': True})),
+        vars(listing(url='https://example.com/14-eddy', nearest_tcat_route='10', elevation_warning=True,
+                     is_official_listing=False, distance_from_campus_miles=0.4)),
+    ]
+    batch = ListingBatch(rows)
+    assert len(batch) == 2
+    assert batch.to_dicts() == rows
+    assert [l.to_dict() for l in batch] == rows
+    assert batch.column('rent_flag') == ['too_low', None]
@@ -0,0 +1,48 @@
+import pytest
+
+from pipeline.history import HistoryStore
+from pipeline.manifest import RunManifest
+
+@pytest.fixture
+def store(tmp_path):
+    s = HistoryStore(str(tmp_path / 'history.sqlite'))
+    yield s
+    s.close()
+
+def row(url):
+    return {'url': url, 'rent': 1000, 'bedrooms': 1, 'bathrooms': 1.0, 'neighborhood': 'n'}
+
+def run(store, taken_at, scraped, failed=(), full_run=True):
+    """Record a run where each source in scraped returned those URLs and each in failed crashed."""
+    manifest = RunManifest(full_run=full_run)
+    data = []
+    for slug, urls in scraped.items():
+        manifest.add(slug, urls)
+        data.extend(row(u) for u in urls)
+    for slug in failed:
+        manifest.fail(slug)
+    return store.record(data, taken_at=taken_at, mark_missing=True, sources=manifest.sources)
+
+def available(store, url):
+    return [o['available'] for o in store.trajectory(url)]
+
+def test_only_run_does_not_hide_other_sources_from_next_full_run(store):
+    run(store, '2026-10-01T00:00:00', {'a': ['https://a/1'], 'b': ['https://b/1']})
+    run(store, '2026-10-02T00:00:00', {'a': ['https://a/1']}, full_run=False)
+    assert available(store, 'https://b/1') == [1]
+    # b ran but no longer lists the URL; its latest observation is still the first run's
+    run(store, '2026-10-03T00:00:00', {'a': ['https://a/1'], 'b': []})
+    assert available(store, 'https://b/1') == [1, 0]
+    assert available(store, 'https://a/1') == [1, 1, 1]
+
+def test_crashed_source_keeps_its_listings(store):
+    run(store, '2026-10-01T00:00:00', {'a': ['https://a/1'], 'b': ['https://b/1']})
+    run(store, '2026-10-02T00:00:00', {'a': []}, failed=['b'])
+    assert available(store, 'https://b/1') == [1]
+    assert available(store, 'https://a/1') == [1, 0]
+
+def test_missing_url_is_marked_once(store):
+    run(store, '2026-10-01T00:00:00', {'a': ['https://a/1']})
+    run(store, '2026-10-02T00:00:00', {'a': []})
+    run(store, '2026-10-03T00:00:00', {'a': []})
+    assert available(store, 'https://a/1') == [1, 0]
@@ -0,0 +1,163 @@
+import time
+
+import pytest
+
+from pipeline import work_queue
+from pipeline.work_queue import WorkQueue, run_worker
+from scrapers import registry
+from scrapers.base import BaseScraper, FetchError, Listing
+
+RUN = 'run-1'
+
+@pytest.fixture
+def queue(tmp_path):
+    q = WorkQueue(str(tmp_path / 'queue.sqlite'), lease_seconds=60, max_attempts=3, retry_delay=5)
+    yield q
+    q.close()
+
+def listing(url):
+    return Listing(title='t', address='a', rent=1000, bedrooms=1, bathrooms=1.0, neighborhood='n',
+                   lease_term='12-month', heating_type='Unknown', description='', url=url)
+
+def test_claim_leases_source_tasks_first(queue):
+    queue.enqueue(RUN, 'a', 'detail', ['https://a/1'])
+    queue.enqueue(RUN, 'b')
+    task = queue.claim(RUN)
+    assert (task['scraper'], task['kind'], task['attempts']) == ('b', 'source', 1)
+    assert queue.status(RUN) == {'leased': 1, 'pending': 1}
+
+def test_leased_task_is_not_claimed_twice(queue, tmp_path):
+    queue.enqueue(RUN, 'a')
+    assert queue.claim(RUN) is not None
+    other = WorkQueue(str(tmp_path / 'queue.sqlite'))
+    assert other.claim(RUN) is None
+    assert other.pending(RUN) == 1
+    other.close()
+
+def test_complete_stores_results(queue):
+    queue.enqueue(RUN, 'a')
+    task = queue.claim(RUN)
+    queue.complete(task, [{'url': 'https://a/1'}])
+    assert queue.status(RUN) == {'done': 1}
+    assert queue.results_by_scraper(RUN) == {'a': [{'url': 'https://a/1'}]}
+    assert queue.claim(RUN) is None
+
+def test_expired_lease_is_reclaimed(queue, monkeypatch):
+    queue.enqueue(RUN, 'a')
+    first = queue.claim(RUN)
+    later = time.time() + 61
+    monkeypatch.setattr(work_queue.time, 'time', lambda: later)
+    again = queue.claim(RUN)
+    assert again['id'] == first['id']
+    assert again['attempts'] == 2
+
+def test_expired_lease_on_last_attempt_is_dead_lettered(queue, monkeypatch):
+    queue.enqueue(RUN, 'a')
+    now = time.time()
+    for attempt in range(3):
+        monkeypatch.setattr(work_queue.time, 'time', lambda: now + attempt * 61)
+        assert queue.claim(RUN)['attempts'] == attempt + 1
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now + 3 * 61)
+    assert queue.claim(RUN) is None
+    assert queue.dead_letters(RUN) == [
+        {'scraper': 'a', 'kind': 'source', 'url': '', 'attempts': 3, 'last_error': 'lease expired'}
+    ]
+
+def test_fail_backs_off_then_retries(queue, monkeypatch):
+    queue.enqueue(RUN, 'a')
+    task = queue.claim(RUN)
+    now = time.time()
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now)
+    queue.fail(task, 'HTTP 429')
+    assert queue.status(RUN) == {'pending': 1}
+    # Not before retry_delay * 2 ** (attempts - 1)
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now + 4)
+    assert queue.claim(RUN) is None
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now + 6)
+    task = queue.claim(RUN)
+    assert task['attempts'] == 2
+    queue.fail(task, 'HTTP 429')
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now + 6 + 9)
+    assert queue.claim(RUN) is None
+
+def test_fail_dead_letters_after_max_attempts(queue, monkeypatch):
+    queue.enqueue(RUN, 'a', 'detail', ['https://a/1'])
+    now = time.time()
+    for attempt in range(3):
+        monkeypatch.setattr(work_queue.time, 'time', lambda: now + attempt * 100)
+        task = queue.claim(RUN)
+        queue.fail(task, f'error {attempt + 1}')
+    assert queue.pending(RUN) == 0
+    assert queue.dead_letters(RUN) == [
+        {'scraper': 'a', 'kind': 'detail', 'url': 'https://a/1', 'attempts': 3, 'last_error': 'error 3'}
+    ]
+
+def test_throttle_spaces_requests_across_workers(queue, tmp_path, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(work_queue.time, 'sleep', sleeps.append)
+    other = WorkQueue(str(tmp_path / 'queue.sqlite'))
+    now = time.time()
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now)
+    assert queue.throttle('a.example', 1) == 0
+    assert other.throttle('a.example', 1) == pytest.approx(1)
+    assert queue.throttle('a.example', 1) == pytest.approx(2)
+    # Other hosts have their own slots
+    assert other.throttle('b.example', 1) == 0
+    assert sleeps == [pytest.approx(1), pytest.approx(2)]
+    other.close()
+
+class FlakyScraper(BaseScraper):
+    DETAIL_DELAY = 0
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def scrape(self):
+        return self.scrape_discovered()
+
+    def discover_urls(self):
+        return ['https://flaky.example/1', 'https://flaky.example/2']
+
+    def scrape_details(self, url):
+        if self.failures.get(url, 0):
+            self.failures[url] -= 1
+            raise FetchError(f"{url}: HTTP 429")
+        return listing(url)
+
+def test_run_worker_retries_fetch_errors(tmp_path, monkeypatch):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite'), max_attempts=3, retry_delay=0)
+    failures = {'https://flaky.example/1': 1, 'https://flaky.example/2': 5}
+    monkeypatch.setattr(registry, 'load_scraper', lambda slug: FlakyScraper(failures))
+    queue.enqueue(RUN, 'flaky')
+    run_worker(queue, RUN)
+    assert [l['url'] for l in queue.results(RUN)] == ['https://flaky.example/1']
+    dead = queue.dead_letters(RUN)
+    assert [(d['url'], d['attempts']) for d in dead] == [('https://flaky.example/2', 3)]
+    assert 'HTTP 429' in dead[0]['last_error']
+    queue.close()
+
+def test_late_fail_does_not_reopen_done_task(queue, tmp_path, monkeypatch):
+    queue.enqueue(RUN, 'a')
+    stale = queue.claim(RUN)
+    now = time.time()
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now + 61)
+    other = WorkQueue(str(tmp_path / 'queue.sqlite'))
+    task = other.claim(RUN)
+    assert other.complete(task, [{'url': 'https://a/1'}])
+    assert not queue.fail(stale, 'timed out')
+    assert queue.status(RUN) == {'done': 1}
+    other.close()
+
+def test_late_complete_is_dropped_after_reclaim(queue, tmp_path, monkeypatch):
+    queue.enqueue(RUN, 'a')
+    stale = queue.claim(RUN)
+    now = time.time()
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now + 61)
+    other = WorkQueue(str(tmp_path / 'queue.sqlite'))
+    task = other.claim(RUN)
+    assert not queue.complete(stale, [{'url': 'https://a/stale'}])
+    assert queue.results(RUN) == []
+    assert other.complete(task, [{'url': 'https://a/1'}])
+    assert queue.results(RUN) == [{'url': 'https://a/1'}]
+    other.close()
@@ -17,7 +17,8 @@ export async function GET(request: Request) {
     const type = searchParams.get('type');
 
     try {
-        let query = supabase.from('listings').select('*');
+        // Expired official listings are soft-deleted by the seed script
+        let query = supabase.from('listings').select('*').is('expired_at', null);
 
         if (neighborhood) query = query.ilike('neighborhood', neighborhood);
         if (minPrice) query = query.gte('rent', parseInt(minPrice));
@@ -0,0 +1,31 @@
+import { createClient } from '@/lib/supabase/server';
+import { NextResponse } from 'next/server';
+
+export const runtime = 'edge';
+
+// Precomputed by scripts/refresh_review_stats.ts; one row read instead of aggregating every review
+export async function GET(request: Request) {
+    const { searchParams } = new URL(request.url);
+    const listingId = searchParams.get('listing_id');
+
+    if (!listingId) {
+        return NextResponse.json({ error: 'Listing ID is required' }, { status: 400 });
+    }
+
+    const supabase = await createClient();
+
+    const { data, error } = await supabase
+        .from('review_stats')
+        .select('review_count, average_rating, rating_counts, helpful_votes, unhelpful_votes, weighted_rating, top_review_id, updated_at')
+        .eq('listing_id', listingId)
+        .maybeSingle();
+
+    if (error) {
+        return NextResponse.json({ error: error.message, details: error }, { status: 500 });
+    }
+
+    // Stats only change when the refresh job runs, so let the CDN absorb repeat views
+    return NextResponse.json(data, {
+        headers: { 'Cache-Control': 'public, s-maxage=60, stale-while-revalidate=300' }
+    });
+}
@@ -26,12 +26,21 @@ interface Review {
     votes: Vote[];
 }
 
+interface ReviewStats {
+    review_count: number;
+    average_rating: number | null;
+    rating_counts: number[];
+    weighted_rating: number | null;
+    updated_at: string;
+}
+
 interface ReviewSectionProps {
     listingId: string;
 }
 
 export default function ReviewSection({ listingId }: ReviewSectionProps) {
     const [reviews, setReviews] = useState<Review[]>([]);
+    const [stats, setStats] = useState<ReviewStats | null>(null);
     const [loading, setLoading] = useState(true);
     const [user, setUser] = useState<User | null>(null);
     const [rating, setRating] = useState(0);
@@ -42,8 +51,37 @@ export default function ReviewSection({ listingId }: ReviewSectionProps) {
         const supabase = createClient();
         supabase.auth.getUser().then(({ data: { user } }) => setUser(user));
         fetchReviews();
+        fetchStats();
     }, [listingId]);
 
+    const fetchStats = async () => {
+        try {
+            const res = await fetch(`/api/reviews/stats?listing_id=${listingId}`);
+            if (res.ok) {
+                setStats(await res.json());
+            }
+        } catch (error) {
+            console.error('Failed to fetch review stats:', error);
+        }
+    };
+
+    // The stats row only changes when the refresh job runs, so apply this user's own
+    // post or delete to the counts locally instead of re-aggregating the review list
+    const adjustStats = (stars: number, delta: number) => {
+        setStats((prev) => {
+            const counts = (prev?.rating_counts ?? [0, 0, 0, 0, 0])
+                .map((c, i) => (i === stars - 1 ? Math.max(0, c + delta) : c));
+            const count = counts.reduce((acc, c) => acc + c, 0);
+            return {
+                review_count: count,
+                average_rating: count ? counts.reduce((acc, c, i) => acc + c * (i + 1), 0) / count : null,
+                rating_counts: counts,
+                weighted_rating: count ? prev?.weighted_rating ?? null : null,
+                updated_at: new Date().toISOString(),
+            };
+        });
+    };
+
     const fetchReviews = async () => {
         console.log('Fetching reviews for listing:', listingId);
         try {
@@ -77,6 +115,7 @@ export default function ReviewSection({ listingId }: ReviewSectionProps) {
             if (res.ok) {
                 setComment('');
                 setRating(0);
+                adjustStats(rating, 1);
                 fetchReviews(); // Refresh reviews
             } else {
                 const errorData = await res.json();
@@ -89,11 +128,12 @@ export default function ReviewSection({ listingId }: ReviewSectionProps) {
         }
     };
 
-    const handleDelete = async (reviewId: string) => {
+    const handleDelete = async (reviewId: string, stars: number) => {
         if (!confirm('Are you sure you want to delete this review?')) return;
         try {
             const res = await fetch(`/api/reviews?id=${reviewId}`, { method: 'DELETE' });
             if (res.ok) {
+                adjustStats(stars, -1);
                 fetchReviews();
             } else {
                 console.error('Failed to delete review');
@@ -134,9 +174,9 @@ export default function ReviewSection({ listingId }: ReviewSectionProps) {
         }
     };
 
-    const averageRating = reviews.length > 0
-        ? (reviews.reduce((acc, r) => acc + r.rating, 0) / reviews.length).toFixed(1)
-        : null;
+    const averageRating = stats?.average_rating != null ? Number(stats.average_rating).toFixed(1) : null;
+    const weightedRating = stats?.weighted_rating != null ? Number(stats.weighted_rating).toFixed(1) : null;
+    const reviewCount = stats?.review_count ?? 0;
 
     return (
         <div className="space-y-8">
@@ -152,11 +192,32 @@ export default function ReviewSection({ listingId }: ReviewSectionProps) {
                                 </svg>
                             ))}
                         </div>
-                        <span className="text-slate-500 text-sm">({reviews.length} reviews)</span>
+                        <span className="text-slate-500 text-sm">({reviewCount} reviews)</span>
                     </div>
                 )}
             </div>
 
+            {/* Rating Breakdown */}
+            {stats && reviewCount > 0 && (
+                <div className="space-y-1 max-w-sm">
+                    {[5, 4, 3, 2, 1].map((star) => {
+                        const count = stats.rating_counts[star - 1] ?? 0;
+                        return (
+                            <div key={star} className="flex items-center gap-2 text-sm">
+                                <span className="w-12 text-slate-600">{star} star</span>
+                                <div className="flex-grow h-2 rounded bg-slate-200">
+                                    <div className="h-2 rounded bg-yellow-400" style={{ width: `${(count / reviewCount) * 100}%` }} />
+                                </div>
+                                <span className="w-8 text-right text-slate-500">{count}</span>
+                            </div>
+                        );
+                    })}
+                    {weightedRating && (
+                        <p className="text-sm text-slate-500 pt-1">{weightedRating} weighted by helpful votes</p>
+                    )}
+                </div>
+            )}
+
             {/* Review Form */}
             {user ? (
                 <div className="bg-slate-50 p-6 rounded-lg border">
@@ -237,7 +298,7 @@ export default function ReviewSection({ listingId }: ReviewSectionProps) {
                                             </span>
                                             {user && user.id === review.user_id && (
                                                 <button
-                                                    onClick={() => handleDelete(review.id)}
+                                                    onClick={() => handleDelete(review.id, review.rating)}
                                                     className="text-xs text-red-500 hover:underline"
                                                 >
                                                     Delete
@@ -0,0 +1,51 @@
+-- Per-source expiry of official listings that stop appearing in scrapes
+alter table listings add column if not exists source text;
+alter table listings add column if not exists missed_scrapes integer not null default 0;
+alter table listings add column if not exists expired_at timestamptz;
+
+create index if not exists listings_source_last_scraped
+  on listings (source, last_scraped_at)
+  where is_official_listing;
+
+-- Reconcile one source after a successful scrape, in three set-based statements:
+-- listings seen again are revived, unseen ones get a miss, and listings that
+-- reach p_grace consecutive misses are soft-deleted via expired_at.
+-- p_source null reconciles rows stored before sources were tracked.
+create or replace function reconcile_source_listings(
+  p_source text,
+  p_seen_urls text[],
+  p_run_at timestamptz,
+  p_grace integer default 3
+)
+returns table (missed integer, expired integer) as $$
+declare
+  v_missed integer;
+  v_expired integer;
+begin
+  update listings
+    set missed_scrapes = 0, expired_at = null
+    where is_official_listing
+      and source is not distinct from p_source
+      and url = any(p_seen_urls)
+      and (missed_scrapes > 0 or expired_at is not null);
+
+  update listings
+    set missed_scrapes = missed_scrapes + 1
+    where is_official_listing
+      and source is not distinct from p_source
+      and last_scraped_at < p_run_at
+      and expired_at is null
+      and not (url = any(p_seen_urls));
+  get diagnostics v_missed = row_count;
+
+  update listings
+    set expired_at = p_run_at
+    where is_official_listing
+      and source is not distinct from p_source
+      and expired_at is null
+      and missed_scrapes >= p_grace;
+  get diagnostics v_expired = row_count;
+
+  return query select v_missed, v_expired;
+end;
+$$ language plpgsql;
@@ -0,0 +1,6 @@
+-- Rent model output from the scrape run. rent_flag is too_low/too_high when the
+-- scraped rent is implausible for the listing, with an _imputed suffix when
+-- --impute-rent replaced rent with rent_estimate. Placeholders (rent=0) are
+-- quarantined before upload and never get here.
+alter table listings add column if not exists rent_estimate integer;
+alter table listings add column if not exists rent_flag text;
@@ -0,0 +1,161 @@
+-- Materialized per-listing review stats, refreshed in batches from a change log
+create table if not exists review_stats (
+  listing_id uuid primary key references listings(id) on delete cascade,
+  review_count integer not null default 0,
+  average_rating numeric(3,2),
+  rating_counts integer[] not null default '{0,0,0,0,0}', -- reviews with 1..5 stars
+  helpful_votes integer not null default 0,
+  unhelpful_votes integer not null default 0,
+  weighted_rating numeric(3,2), -- average rating, each review weighted by 1 + its helpfulness
+  top_review_id uuid references reviews(id) on delete set null,
+  updated_at timestamptz not null default now()
+);
+
+alter table review_stats enable row level security;
+
+drop policy if exists "Review stats are viewable by everyone" on review_stats;
+create policy "Review stats are viewable by everyone"
+  on review_stats for select
+  using ( true );
+
+-- Listings whose reviews or votes changed since the last refresh. The id is the
+-- watermark: a refresh consumes rows up to the newest id it can see, so a change
+-- committed while it runs is left for the next one.
+create table if not exists review_stats_changes (
+  id bigserial primary key,
+  listing_id uuid not null,
+  changed_at timestamptz not null default now()
+);
+
+-- No policies: only the triggers below and the service role touch it
+alter table review_stats_changes enable row level security;
+
+create or replace function log_review_change()
+returns trigger as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') and old.listing_id is not null then
+    insert into review_stats_changes (listing_id) values (old.listing_id);
+  end if;
+  if tg_op = 'INSERT' or (tg_op = 'UPDATE' and new.listing_id is distinct from old.listing_id) then
+    if new.listing_id is not null then
+      insert into review_stats_changes (listing_id) values (new.listing_id);
+    end if;
+  end if;
+  return null;
+end;
+$$ language plpgsql security definer set search_path = public;
+
+create or replace function log_review_vote_change()
+returns trigger as $$
+begin
+  -- OLD is null on insert and NEW on delete; votes removed by a review's
+  -- cascade find no review here, but the review's own trigger logged it
+  insert into review_stats_changes (listing_id)
+    select distinct listing_id from reviews
+    where id in (old.review_id, new.review_id) and listing_id is not null;
+  return null;
+end;
+$$ language plpgsql security definer set search_path = public;
+
+drop trigger if exists reviews_log_change on reviews;
+create trigger reviews_log_change
+  after insert or delete on reviews
+  for each row execute function log_review_change();
+
+-- Comment edits don't move the stats
+drop trigger if exists reviews_log_rating_change on reviews;
+create trigger reviews_log_rating_change
+  after update of rating, listing_id on reviews
+  for each row execute function log_review_change();
+
+drop trigger if exists review_votes_log_change on review_votes;
+create trigger review_votes_log_change
+  after insert or delete or update of vote_type, review_id on review_votes
+  for each row execute function log_review_vote_change();
+
+-- Lower bound of the 95% Wilson interval for the share of helpful votes, so one
+-- upvote doesn't outrank forty upvotes and two downvotes
+create or replace function review_helpfulness(p_up integer, p_down integer)
+returns double precision as $$
+  select case when p_up + p_down = 0 then 0.0 else
+    ((p_up::float8 / (p_up + p_down)) + 1.9208 / (p_up + p_down)
+      - 1.96 * sqrt((p_up::float8 * p_down) / (p_up + p_down) + 0.9604) / (p_up + p_down))
+    / (1 + 3.8416 / (p_up + p_down))
+  end;
+$$ language sql immutable;
+
+-- Recompute stats for listings in the change log, oldest changes first. Each
+-- dirty listing is recomputed from its own reviews (reviews are indexed by
+-- listing_id, votes by review_id), so the cost follows what changed rather
+-- than the size of the tables. Call repeatedly until changes comes back 0.
+create or replace function refresh_review_stats(p_batch integer default 10000)
+returns table (listings integer, changes integer) as $$
+declare
+  v_ids uuid[];
+  v_changes integer;
+begin
+  with consumed as (
+    delete from review_stats_changes
+      where id in (
+        select id from review_stats_changes order by id limit p_batch for update skip locked
+      )
+      returning listing_id
+  )
+  select array_agg(distinct listing_id), count(*) into v_ids, v_changes from consumed;
+
+  if v_changes = 0 then
+    return query select 0, 0;
+    return;
+  end if;
+
+  delete from review_stats s
+    where s.listing_id = any(v_ids)
+      and not exists (select 1 from reviews r where r.listing_id = s.listing_id);
+
+  insert into review_stats (
+    listing_id, review_count, average_rating, rating_counts, helpful_votes,
+    unhelpful_votes, weighted_rating, top_review_id, updated_at
+  )
+  select
+    listing_id,
+    count(*),
+    avg(rating),
+    array[
+      count(*) filter (where rating = 1), count(*) filter (where rating = 2),
+      count(*) filter (where rating = 3), count(*) filter (where rating = 4),
+      count(*) filter (where rating = 5)
+    ]::integer[],
+    sum(up),
+    sum(down),
+    sum(rating * (1 + helpfulness)) / sum(1 + helpfulness),
+    (array_agg(id order by helpfulness desc, up desc, created_at desc) filter (where up > 0))[1],
+    now()
+  from (
+    select r.id, r.listing_id, r.rating, r.created_at, v.up, v.down,
+      review_helpfulness(v.up, v.down) as helpfulness
+    from reviews r
+    cross join lateral (
+      select count(*) filter (where vote_type = 1)::integer as up,
+             count(*) filter (where vote_type = -1)::integer as down
+      from review_votes where review_id = r.id
+    ) v
+    where r.listing_id = any(v_ids)
+  ) scored
+  group by listing_id
+  on conflict (listing_id) do update set
+    review_count = excluded.review_count,
+    average_rating = excluded.average_rating,
+    rating_counts = excluded.rating_counts,
+    helpful_votes = excluded.helpful_votes,
+    unhelpful_votes = excluded.unhelpful_votes,
+    weighted_rating = excluded.weighted_rating,
+    top_review_id = excluded.top_review_id,
+    updated_at = excluded.updated_at;
+
+  return query select coalesce(array_length(v_ids, 1), 0), v_changes;
+end;
+$$ language plpgsql;
+
+-- Backfill: every listing with reviews starts out dirty
+insert into review_stats_changes (listing_id)
+  select distinct listing_id from reviews where listing_id is not null;